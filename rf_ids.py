@@ -9,16 +9,22 @@ This adds:
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from rtlsdr import RtlSdr
 import time
 import datetime
 import os
 import json
+import hashlib
+import io
 import smtplib
 from email.message import EmailMessage
 import threading
+import queue
 import pickle
 from scipy import signal
+from scipy import fft as scipy_fft
 import sys
 import curses
 from curses import wrapper
@@ -26,6 +32,11 @@ import traceback
 import requests
 from typing import Dict, List, Any, Tuple, Optional
 import csv
+import math
+import atexit
+import contextlib
+from collections import deque
+from itertools import cycle, islice
 
 # For macOS notifications
 try:
@@ -34,6 +45,25 @@ try:
 except ImportError:
     NOTIFICATIONS_AVAILABLE = False
 
+# Optional JIT compilation of the numeric hot paths
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional faster JSON encoder for saving the config
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Maximum number of log entries to keep
+MAX_LOG_ENTRIES = 10
+# Maximum number of (newest) log file rows kept for the log viewer
+MAX_VIEWER_ENTRIES = 10000
+
 # Global variables for dashboard display
 DASHBOARD = {
     'status': 'Initializing...',
@@ -42,26 +72,323 @@ DASHBOARD = {
     'last_alert_time': None,
     'alert_count': 0,
     'frequencies': [],
-    'error_log': [],
-    'monitoring_log': [],
-    'start_time': time.time(),  # Track system uptime
+    'error_log': deque(maxlen=MAX_LOG_ENTRIES),
+    'monitoring_log': deque(maxlen=MAX_LOG_ENTRIES),
+    'start_time': time.monotonic(),  # Track system uptime
     'scan_count': 0,            # Track number of scans
     'signal_level': 0.0,        # Current signal level (0.0-1.0)
     'early_detection': None,    # For detecting devices at longer range
     'early_detection_time': None, # Timestamp for early detection
     'viewing_logs': False,      # Flag to indicate if we're viewing logs
     'log_page': 0,              # Current page of logs being viewed
-    'log_entries': []           # Cached log entries when viewing
+    'log_entries': deque(maxlen=MAX_VIEWER_ENTRIES),  # Cached log entries when viewing
+    'total_pages': 1            # Page count of log_entries, set when they are loaded
 }
 
-# Maximum number of log entries to keep
-MAX_LOG_ENTRIES = 10
+# Multiplier that packs center and anomaly frequency (kHz) into one tracker id
+ANOMALY_KEY_STRIDE = 10 ** 10
+# Minimum seconds between writes of config changes made while monitoring
+CONFIG_SAVE_INTERVAL = 5.0
+# Default minimum seconds between dashboard redraws (alerts are drawn immediately),
+# overridable with the 'dashboard_redraw_interval' config key
+DASHBOARD_REDRAW_INTERVAL = 0.1
+# Number of cells in the dashboard signal meter
+SIGNAL_METER_WIDTH = 20
+# Signal meter levels cycled through while meter reads fail, to show the system is alive
+METER_IDLE_LEVELS = (0.15, 0.22, 0.18, 0.27, 0.12, 0.30)
+# I/Q samples read per frequency for the signal meter - 32 KiB transfers are where
+# librtlsdr's per-call overhead levels off, for ~7 ms of capture at 2.4 MS/s
+METER_SAMPLES = 16384
+# Milliseconds getch() blocks waiting for a key press
+INPUT_POLL_TIMEOUT_MS = 50
+# ...and while the log viewer is open, where there is no scanning to get back to
+LOG_VIEWER_POLL_TIMEOUT_MS = 100
+# Consecutive failures before a frequency is dropped from monitoring...
+MONITOR_MAX_FAILURES = 3
+# ...and seconds a failing frequency is skipped before it is retried
+MONITOR_RETRY_COOLDOWN = 2.0
+# Shortest sleep when every frequency is cooling down, so the sweep does not spin
+COOLDOWN_MIN_WAIT = 0.05
+# Seconds the RTL-SDR health probe may take before the device is treated as hung
+SDR_PROBE_TIMEOUT = 0.2
+# ...and seconds shutdown waits for such a hung probe before leaving the device open
+SDR_CLOSE_WAIT = 1.0
 # Number of log entries per page in log viewer
 LOG_ENTRIES_PER_PAGE = 15
+# Buffered CSV log rows are written out once this many are pending...
+LOG_FLUSH_ROWS = 64
+# ...or once this many seconds have passed since the last write
+LOG_FLUSH_INTERVAL = 2.0
+# Write buffer size for the open CSV log handles
+LOG_WRITE_BUFFER = 65536
+# Alerts of one kind (spectrum anomalies, or proximity per device type) are throttled by
+# a token bucket: up to ALERT_BURST back to back, then one per interval (seconds)
+ALERT_BURST = 3
+ANOMALY_ALERT_INTERVAL = 300
+PROXIMITY_ALERT_INTERVAL = 60
+# Alert emails/SMS waiting for the alert thread - when full, the oldest is dropped
+ALERT_QUEUE_SIZE = 16
+# Seconds an SMTP connect or command may block the scan loop before the alert gives up
+SMTP_TIMEOUT = 10
+# Resolution of the saved anomaly/proximity plots - enough to read the annotations,
+# and fewer pixels to render and PNG-encode than matplotlib's default 100
+PLOT_DPI = 90
+# CSV log header rows
+ANOMALY_LOG_HEADER = ['timestamp', 'first_seen', 'last_seen', 'center_freq', 'anomaly_freq',
+                      'difference_db', 'signal_increase_pct', 'estimated_distance', 'type']
+PROXIMITY_LOG_HEADER = ['timestamp', 'first_seen', 'last_seen', 'device_type',
+                        'frequency', 'power_db', 'distance', 'status']
+# CSV log line templates - none of the fields can contain commas or quotes, so
+# they skip csv.writer; lines end in \r\n like the csv-written headers
+ANOMALY_LOG_LINE = "{},{},{},{},{:.3f},{:.2f},{:.1f},{},{}\r\n".format
+PROXIMITY_LOG_LINE = "{},{},{},{},{},{:.2f},{},{}\r\n".format
+
+# ln(10)/10 - converts a dB difference to a natural exponent (10**(x/10) == e**(x*LN10_OVER_10))
+LN10_OVER_10 = math.log(10) / 10
+
+# Proximity device types: (type, calibrated frequency key, reference power key,
+# distance threshold key, dashboard label)
+PROXIMITY_CHECKS = (
+    ('wireless', 'wireless_freq', 'wireless_power', 'bluetooth_distance_threshold', 'Wireless device'),
+    ('cellular', 'cellular_freq', 'cellular_power', 'cellular_distance_threshold', 'Cell phone'),
+)
+
+# Formatted timestamps per strftime format: format -> (epoch second, string)
+_ts_cache = {}
+
+def _now_str(fmt="%Y-%m-%d %H:%M:%S"):
+    """Current local time formatted with fmt, re-formatted at most once per second"""
+    sec = int(time.time())
+    cached = _ts_cache.get(fmt)
+    if cached is None or cached[0] != sec:
+        cached = (sec, time.strftime(fmt, time.localtime(sec)))
+        _ts_cache[fmt] = cached
+    return cached[1]
+
+def _signal_increase_vec(current_power, baseline_power):
+    """Percentage increase of linear power for arrays of dB values, clipped to 0-10,000%"""
+    # (current_linear - baseline_linear) / baseline_linear == 10**(diff_db/10) - 1,
+    # so a single expm1 of the dB difference replaces two dB->linear conversions
+    diff_db = np.asarray(current_power, dtype=np.float32) - np.asarray(baseline_power, dtype=np.float32)
+    increase = np.expm1(diff_db * np.float32(LN10_OVER_10)) * np.float32(100.0)
+    return np.clip(increase, 0.0, 10000.0)
+
+def _signal_increase_scalar(current_power, baseline_power):
+    """Percentage increase for a single pair of dB values, clipped to 0-10,000%"""
+    increase = math.expm1((current_power - baseline_power) * LN10_OVER_10) * 100.0
+    return min(max(increase, 0.0), 10000.0)
+
+# Distance correction per frequency band (<400, 400-800, >=800 MHz) - higher
+# frequencies have shorter range
+FREQ_FACTOR_LUT = np.array([1.0, 0.85, 0.7], dtype=np.float32)
+
+def _freq_factor(freq_mhz):
+    """Look up the distance correction for each frequency without branching"""
+    freq_mhz = np.asarray(freq_mhz)
+    bucket = (freq_mhz >= 400).astype(np.int8)
+    bucket += freq_mhz >= 800
+    return FREQ_FACTOR_LUT[bucket]
+
+if NUMBA_AVAILABLE:
+    # fastmath without 'nnan' - the kernel writes NaN for bins below baseline
+    @numba.njit(cache=True, fastmath={'nsz', 'arcp', 'contract', 'afn', 'reassoc'}, parallel=True, nogil=True)
+    def _score_bins(current_psd, baseline_psd, freq_factor, thresh_db):
+        """Score the bins that deviate from the baseline: (hit indices, distances, % increases)"""
+        n = current_psd.shape[0]
+        # Compact the indices of the bins over threshold in one branchless pass
+        # (every index is stored, only hits advance the count) - no mask array
+        hits = np.empty(n, dtype=np.intp)
+        m = 0
+        for i in range(n):
+            hits[m] = i
+            m += abs(current_psd[i] - baseline_psd[i]) > thresh_db
+        hits = hits[:m]
+        
+        # Only the (few) hits get scored
+        distances = np.empty(m, dtype=np.float32)
+        increases = np.empty(m, dtype=np.float32)
+        for j in numba.prange(m):
+            i = hits[j]
+            diff = current_psd[i] - baseline_psd[i]
+            
+            # Percentage increase of linear power, clipped to 0-10,000%
+            increase = math.expm1(diff * LN10_OVER_10) * 100.0
+            increases[j] = min(max(increase, 0.0), 10000.0)
+            
+            # 6dB-per-halving distance from a 50 foot reference, see estimate_distance
+            if diff > 0:
+                distance = 50.0 / math.pow(10.0, diff / 20.0) * freq_factor[i]
+                distances[j] = min(max(distance, 1.0), 100.0)
+            else:
+                distances[j] = np.nan
+        return hits, distances, increases
+else:
+    def _score_bins(current_psd, baseline_psd, freq_factor, thresh_db):
+        """Score the bins that deviate from the baseline: (hit indices, distances, % increases)"""
+        diff = current_psd - baseline_psd
+        abs_diff = np.abs(diff)
+        
+        hits = np.flatnonzero(abs_diff > thresh_db)
+        
+        # Only the (few) hits get scored
+        diff = diff[hits]
+        
+        # Percentage increase of linear power, clipped to 0-10,000%
+        increases = np.clip(np.expm1(diff * np.float32(LN10_OVER_10)) * 100, 0, 10000)
+        
+        # 6dB-per-halving distance from a 50 foot reference, see estimate_distance
+        distances = 50 / np.power(np.float32(10.0), diff / np.float32(20.0))
+        distances *= freq_factor[hits]
+        distances = np.where(diff > 0, np.clip(distances, 1, 100), np.nan)
+        return hits, distances, increases
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True, nogil=True)
+    def _u8_to_iq(raw, out):
+        """Raw 8-bit I/Q bytes to interleaved I/Q floats in +/-1.0 (as read_samples scales them), into out"""
+        scale = np.float32(1 / 127.5)
+        for i in range(out.size):
+            out[i] = raw[i] * scale - np.float32(1.0)
+else:
+    def _u8_to_iq(raw, out):
+        """Raw 8-bit I/Q bytes to interleaved I/Q floats in +/-1.0 (as read_samples scales them), into out"""
+        np.subtract(raw[:out.size], 127.5, out=out, dtype=np.float32)
+        out *= np.float32(1 / 127.5)
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True, nogil=True)
+    def _signal_level(iq):
+        """Signal meter reading for interleaved I/Q floats: (0.1-1.0 level, power in dB)"""
+        acc = 0.0
+        for i in range(iq.size):
+            acc += iq[i] * iq[i]
+        power = acc / (iq.size // 2)
+        db = 10.0 * math.log10(power + 1e-10)  # Avoid log(0)
+        # Log scale normalized to 0.1-1.0 so the meter never shows empty
+        return 0.1 + 0.9 * min(1.0, max(0.0, (db * 0.1 + 10.0) * 0.1)), db
+else:
+    def _signal_level(iq):
+        """Signal meter reading for interleaved I/Q floats: (0.1-1.0 level, power in dB)"""
+        power = float(np.dot(iq, iq)) / (iq.size // 2)
+        db = 10.0 * math.log10(power + 1e-10)  # Avoid log(0)
+        # Log scale normalized to 0.1-1.0 so the meter never shows empty (clamped
+        # with comparisons rather than the min/max builtins, this runs every scan)
+        level = (db * 0.1 + 10.0) * 0.1
+        level = 0.0 if level < 0.0 else (1.0 if level > 1.0 else level)
+        return 0.1 + 0.9 * level, db
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, fastmath=True, parallel=True, nogil=True)
+    def _window_segments(samples, window, step, out):
+        """Detrend (remove the mean of) and window each segment of samples into out's rows"""
+        n_seg, n = out.shape
+        for s in numba.prange(n_seg):
+            start = s * step
+            mean_re = 0.0
+            mean_im = 0.0
+            for i in range(n):
+                mean_re += samples[start + i].real
+                mean_im += samples[start + i].imag
+            # Keep the per-sample math in single precision like the samples
+            mean = np.complex64(complex(mean_re / n, mean_im / n))
+            for i in range(n):
+                out[s, i] = (samples[start + i] - mean) * window[i]
+    
+    @numba.njit(cache=True, fastmath=True, nogil=True)
+    def _mean_power(spectrum, out):
+        """Average the segment periodograms |X|^2 into out"""
+        n_seg, n = spectrum.shape
+        out[:] = 0.0
+        # Row by row, so both arrays are walked in memory order
+        for s in range(n_seg):
+            for i in range(n):
+                x = spectrum[s, i]
+                out[i] += x.real * x.real + x.imag * x.imag
+        out *= 1.0 / n_seg
+else:
+    def _window_segments(samples, window, step, out):
+        """Detrend (remove the mean of) and window each segment of samples into out's rows"""
+        n_seg, n = out.shape
+        # 50% overlapping segments as views into the samples, no copy
+        segments = np.lib.stride_tricks.sliding_window_view(samples, n)[::step][:n_seg]
+        np.subtract(segments, segments.mean(axis=1, keepdims=True), out=out)
+        out *= window
+    
+    def _mean_power(spectrum, out):
+        """Average the segment periodograms |X|^2 into out"""
+        power = spectrum.real ** 2
+        power += spectrum.imag ** 2
+        np.mean(power, axis=0, out=out)
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, nogil=True)
+    def _peak_deviation(current_psd, baseline_psd):
+        """Bin and value of the largest deviation from the baseline, found in one pass"""
+        peak_idx = 0
+        peak_diff = 0.0
+        for i in range(current_psd.shape[0]):
+            diff = current_psd[i] - baseline_psd[i]
+            if abs(diff) > abs(peak_diff):
+                peak_idx = i
+                peak_diff = diff
+        return peak_idx, peak_diff
+else:
+    def _peak_deviation(current_psd, baseline_psd):
+        """Bin and value of the largest deviation from the baseline, found in one pass"""
+        diff = current_psd - baseline_psd
+        peak_idx = int(np.abs(diff).argmax())
+        return peak_idx, float(diff[peak_idx])
+
+if NUMBA_AVAILABLE:
+    @numba.njit(cache=True, nogil=True)
+    def _power_to_db(power, offset_db):
+        """10*log10(power) + offset_db into a new float32 array, in one pass"""
+        out = np.empty(power.size, dtype=np.float32)
+        for i in range(power.size):
+            out[i] = 10.0 * math.log10(power[i]) + offset_db
+        return out
+else:
+    def _power_to_db(power, offset_db):
+        """10*log10(power) + offset_db into a new float32 array, in one pass"""
+        out = np.log10(power)
+        out *= np.float32(10.0)
+        out += np.float32(offset_db)
+        return out
+
+def _set_plot_limits(ax, frequencies, ymin, ymax):
+    """Fix an axis' limits from known data ranges so matplotlib doesn't autoscale"""
+    margin = (ymax - ymin) * 0.05 or 1.0  # same 5% headroom autoscaling would add
+    ax.set_xlim(frequencies.min(), frequencies.max())
+    ax.set_ylim(ymin - margin, ymax + margin)
+    ax.set_autoscale_on(False)
+
+class _Track:
+    """First/last-seen record of a tracked proximity device"""
+    __slots__ = ('first_seen', 'last_seen', 'status')
+    
+    def __init__(self, first_seen, last_seen, status):
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.status = status
+
+class _AlertBucket:
+    """Token bucket throttling one kind of alert, with a count of the alerts it held back"""
+    __slots__ = ('tokens', 'updated', 'suppressed')
+    
+    def __init__(self, now):
+        self.tokens = ALERT_BURST
+        self.updated = now
+        self.suppressed = 0
 
 class RFIntrusionDetector:
     def __init__(self, config_file='config.json', stdscr=None):
         self.stdscr = stdscr  # Curses screen for dashboard
+        self._last_draw_ts = 0.0     # Monotonic time of the last dashboard redraw
+        self._redraw_interval = DASHBOARD_REDRAW_INTERVAL
+        self._rendered_size = None   # Terminal size the dashboard was last drawn at
+        self._viewer_drawn_at = None # Clock second shown by the last log viewer draw
+        self._last_rendered = {}     # Row -> segments currently on screen
+        self._layout = None          # Size-dependent dashboard positions
         self.update_dashboard(status="Loading configuration...")
         
         # Load configuration
@@ -71,24 +398,55 @@ class RFIntrusionDetector:
         if self.config.get('run_setup', False):
             self.update_dashboard(status="Running initial setup...")
             self.config = self.setup_initial_config()
+        
+        # Alert delivery settings don't change while running
+        self._init_alert_settings()
+        self._redraw_interval = float(self.config.get('dashboard_redraw_interval', DASHBOARD_REDRAW_INTERVAL))
+        self._config_dirty = False  # In-memory config changes not yet written, see save_config
+        self._last_config_save = time.monotonic()
+        self._pending_removals = set()  # Frequencies to stop monitoring after the current sweep
+        self._monitor_failures = {}     # Frequency -> consecutive failed monitor attempts
+        self._cooldown_until = {}       # Frequency -> monotonic time it is skipped until
+        
+        # Off-screen figures reused for alert plots: figsize -> (figure, canvas)
+        self._plot_figures = {}
             
         # Initialize SDR
+        self._sdr_probe = None  # Last health probe thread, see sdr_healthy
         try:
             self.update_dashboard(status="Initializing RTL-SDR device...")
-            self.sdr = RtlSdr()
-            self.sdr.sample_rate = self.config['sample_rate']
+            self._init_sdr()
             self.sdr.center_freq = 100e6  # Start with a safe frequency
-            self.sdr.gain = self.config['gain']
             
-            # Determine frequency range
-            self.update_dashboard(status="Testing maximum frequency capability...")
-            max_freq = self.test_max_frequency()
+            # Determine frequency range (reuse the cached result for a known device,
+            # unless 'reprobe_max_freq' asks for a fresh test this once)
+            device_id = self.get_device_id()
+            reprobe = self.config.pop('reprobe_max_freq', False)
+            if not reprobe and device_id and self.config.get('device_max_freq') and self.config.get('device_id') == device_id:
+                max_freq = self.config['device_max_freq']
+                self.update_dashboard(log_message="Using cached maximum frequency for this device")
+            else:
+                self.update_dashboard(status="Testing maximum frequency capability...")
+                max_freq = self.test_max_frequency()
             self.update_dashboard(status=f"Maximum reliable frequency: {max_freq/1e6:.1f} MHz")
             self.config['device_max_freq'] = max_freq
+            self.config['device_id'] = device_id
             
             # Filter frequencies that are too high
             self.filter_invalid_frequencies()
             
+            # Precompute the spectrum estimation window and scratch buffers
+            self._init_spectrum_buffers()
+            self._freq_factor_cache = {}  # center freq -> per-bin distance correction
+            self._threshold_cached = float(self.config['threshold'])
+            # Compile/load the meter kernels before the first scan
+            _u8_to_iq(np.zeros(2, dtype=np.uint8), self._meter_iq[:2])
+            _signal_level(self._meter_iq[:2])
+            
+            # Opt-in coarser scoring while the spectrum stays quiet, see scan_stride
+            self._adaptive_stride = bool(self.config.get('adaptive_scan_stride', False))
+            self._quiet_runs = 0
+            
         except Exception as e:
             self.update_dashboard(status=f"Error initializing RTL-SDR: {e}", error=True)
             print(f"Error initializing RTL-SDR: {e}")
@@ -102,30 +460,45 @@ class RFIntrusionDetector:
         
         # Create output directory
         os.makedirs(self.config['output_dir'], exist_ok=True)
+        # Output directory with a trailing separator, so file paths are a plain concatenation
+        self._outdir_sep = os.path.join(self.config['output_dir'], '')
         
         # Create enhanced log file with CSV header if it doesn't exist
         self.enhanced_log_file = os.path.join(self.config['output_dir'], 'enhanced_anomalies.csv')
-        if not os.path.exists(self.enhanced_log_file):
-            with open(self.enhanced_log_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'timestamp', 'first_seen', 'last_seen', 'center_freq', 
-                    'anomaly_freq', 'difference_db', 'signal_increase_pct',
-                    'estimated_distance', 'type'
-                ])
+        self.create_log_file(self.enhanced_log_file, ANOMALY_LOG_HEADER)
         
         # Create log file for proximity detections with CSV header if it doesn't exist
         self.proximity_log_file = os.path.join(self.config['output_dir'], 'proximity_log.csv')
-        if not os.path.exists(self.proximity_log_file):
-            with open(self.proximity_log_file, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'timestamp', 'first_seen', 'last_seen', 'device_type', 
-                    'frequency', 'power_db', 'distance', 'status'
-                ])
-        
-        # Anomaly tracking dictionary - for storing first_seen/last_seen
+        self.create_log_file(self.proximity_log_file, PROXIMITY_LOG_HEADER)
+        
+        # Keep both CSV logs open and buffer their pre-formatted lines, so each
+        # detection doesn't pay for its own open(); a 64 KiB buffer lets a
+        # whole batch go out in a single write() call
+        self._anom_fh = open(self.enhanced_log_file, 'a', newline='', buffering=LOG_WRITE_BUFFER)
+        self._prox_fh = open(self.proximity_log_file, 'a', newline='', buffering=LOG_WRITE_BUFFER)
+        self._anom_buf = []
+        self._prox_buf = []
+        # Plain-text logs kept for backward compatibility, handled the same way
+        self._legacy_fh = open(os.path.join(self.config['output_dir'], 'anomalies.log'), 'a', buffering=LOG_WRITE_BUFFER)
+        self._alert_fh = open(os.path.join(self.config['output_dir'], 'proximity_alerts.log'), 'a', buffering=LOG_WRITE_BUFFER)
+        self._legacy_buf = []
+        self._alert_buf = []
+        self._last_log_flush = time.monotonic()
+        # Write out pending rows at exit if close() is never called (close() unregisters this)
+        atexit.register(self.close_logs)
+        
+        # Parsed log viewer rows per log type: (mtime, bytes read, entries)
+        self._log_cache = {}
+        
+        # Spectral anomaly tracker - parallel arrays sorted by anomaly id
+        self._atk_key = np.empty(0, dtype=np.int64)
+        self._atk_first = np.empty(0, dtype='datetime64[s]')
+        self._atk_last = np.empty(0, dtype='datetime64[s]')
+        self._atk_power = np.empty(0, dtype=np.float32)
+        
+        # Proximity device tracking dictionary - device key -> _Track
         self.anomaly_tracker = {}
+        self.init_proximity_refs()
         
         # Load baseline if exists
         self.baseline = None
@@ -135,7 +508,7 @@ class RFIntrusionDetector:
         
         # Alert counter
         self.alert_count = 0
-        self.last_alert_time = datetime.datetime.now() - datetime.timedelta(hours=1)
+        self._alert_buckets = {}  # Alert kind -> _AlertBucket, see throttle_alert
         
         # Last anomaly details
         self.last_anomaly = None
@@ -151,22 +524,17 @@ class RFIntrusionDetector:
             DASHBOARD['current_freq'] = current_freq
             
         if log_message:
-            timestamp = datetime.datetime.now().strftime("%H:%M:%S")
+            timestamp = _now_str("%H:%M:%S")
             entry = f"[{timestamp}] {log_message}"
+            # Bounded deques drop the oldest entry automatically
             if error:
-                DASHBOARD['error_log'].insert(0, entry)
-                # Trim log if too long
-                if len(DASHBOARD['error_log']) > MAX_LOG_ENTRIES:
-                    DASHBOARD['error_log'] = DASHBOARD['error_log'][:MAX_LOG_ENTRIES]
+                DASHBOARD['error_log'].appendleft(entry)
             else:
-                DASHBOARD['monitoring_log'].insert(0, entry)
-                # Trim log if too long
-                if len(DASHBOARD['monitoring_log']) > MAX_LOG_ENTRIES:
-                    DASHBOARD['monitoring_log'] = DASHBOARD['monitoring_log'][:MAX_LOG_ENTRIES]
+                DASHBOARD['monitoring_log'].appendleft(entry)
         
         if alert:
             DASHBOARD['last_anomaly'] = alert
-            DASHBOARD['last_alert_time'] = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            DASHBOARD['last_alert_time'] = _now_str()
             DASHBOARD['alert_count'] += 1
         
         # Update frequencies list
@@ -174,79 +542,90 @@ class RFIntrusionDetector:
             DASHBOARD['frequencies'] = self.config['frequencies']
         
         # If curses is available, refresh the display
-        if self.stdscr and not DASHBOARD.get('viewing_logs', False):
-            self.draw_dashboard()
+        if self.stdscr and not DASHBOARD['viewing_logs']:
+            self.draw_dashboard(force=alert is not None)
     
-    def draw_dashboard(self):
-        """Draw the dashboard using curses"""
+    def draw_dashboard(self, force=False):
+        """Draw the dashboard using curses, repainting only the rows that changed"""
         try:
             if not self.stdscr:
                 return
-                
-            # Get terminal dimensions
-            height, width = self.stdscr.getmaxyx()
-            
-            # Clear screen
-            self.stdscr.clear()
-            
-            # Draw border
-            self.stdscr.border()
             
-            # Title
-            title = "RF Intrusion Detection System"
-            self.stdscr.addstr(0, (width - len(title)) // 2, title)
+            # Limit redraws to one per redraw interval unless forced (alerts)
+            now = time.monotonic()
+            if not force and now - self._last_draw_ts < self._redraw_interval:
+                return
+            self._last_draw_ts = now
+                
+            # Recompute the layout and start from a clean, bordered screen on
+            # the first draw or after the terminal was resized
+            if self._rendered_size is None or curses.is_term_resized(*self._rendered_size):
+                height, width = self.stdscr.getmaxyx()
+                self._layout = self.compute_dashboard_layout(height, width)
+                self.stdscr.clear()
+                self.stdscr.border()
+                self._rendered_size = (height, width)
+                self._last_rendered = {}
+            height, width = self._rendered_size
+            layout = self._layout
+            
+            # Collect what goes on each row as (x, text, attr) segments
+            rows = {}
+            def put(y, x, text, attr=curses.A_NORMAL):
+                rows.setdefault(y, []).append((x, text, attr))
+            
+            # Static labels
+            for y, x, text in layout['labels']:
+                put(y, x, text)
             
             # Active indicator (spinner) and current time
             spinner_chars = "|/-\\"
             spinner_idx = int(time.time()) % len(spinner_chars)
-            current_time = datetime.datetime.now().strftime("%H:%M:%S")
-            active_indicator = f"[{spinner_chars[spinner_idx]}] Active - {current_time}"
-            self.stdscr.addstr(0, width - len(active_indicator) - 2, active_indicator)
+            current_time = _now_str("%H:%M:%S")
+            put(0, layout['active_x'], f"[{spinner_chars[spinner_idx]}] Active - {current_time}")
             
             # Status area
-            self.stdscr.addstr(2, 2, "Status: " + DASHBOARD['status'])
+            put(2, 2, "Status: " + DASHBOARD['status'])
             
             # Current frequency
             if DASHBOARD['current_freq'] is not None:
-                self.stdscr.addstr(3, 2, f"Current Frequency: {DASHBOARD['current_freq']} MHz")
+                put(3, 2, f"Current Frequency: {DASHBOARD['current_freq']} MHz")
             
             # Monitoring frequencies
             freq_str = ", ".join(map(str, DASHBOARD['frequencies']))
             if len(freq_str) > width - 25:
                 freq_str = freq_str[:width-28] + "..."
-            self.stdscr.addstr(4, 2, f"Monitoring: {freq_str}")
+            put(4, 2, f"Monitoring: {freq_str}")
             
             # Alert count
-            self.stdscr.addstr(5, 2, f"Alerts: {DASHBOARD['alert_count']}")
+            put(5, 2, f"Alerts: {DASHBOARD['alert_count']}")
             
             # System uptime and scan info
-            uptime_str = f"Uptime: {int(time.time() - DASHBOARD.get('start_time', time.time()))}s"
+            uptime_str = f"Uptime: {int(time.monotonic() - DASHBOARD['start_time'])}s"
             scan_count = DASHBOARD.get('scan_count', 0)
             scan_str = f"Scans: {scan_count}"
-            self.stdscr.addstr(5, width - len(uptime_str) - 2, uptime_str)
-            self.stdscr.addstr(4, width - len(scan_str) - 2, scan_str)
+            put(5, width - len(uptime_str) - 2, uptime_str)
+            put(4, width - len(scan_str) - 2, scan_str)
             
             # Last anomaly
-            self.stdscr.addstr(7, 2, "=== Last Alert ===")
             if DASHBOARD['last_anomaly']:
                 anomaly_info = DASHBOARD['last_anomaly']
-                self.stdscr.addstr(8, 2, f"Type: {anomaly_info.get('type', 'Unknown')}")
-                self.stdscr.addstr(9, 2, f"Time: {DASHBOARD['last_alert_time']}")
+                put(8, 2, f"Type: {anomaly_info.get('type', 'Unknown')}")
+                put(9, 2, f"Time: {DASHBOARD['last_alert_time']}")
                 if 'frequency' in anomaly_info:
-                    self.stdscr.addstr(10, 2, f"Frequency: {anomaly_info['frequency']} MHz")
+                    put(10, 2, f"Frequency: {anomaly_info['frequency']} MHz")
                 if 'power' in anomaly_info:
-                    self.stdscr.addstr(11, 2, f"Signal: {anomaly_info['power']:.2f} dB")
+                    put(11, 2, f"Signal: {anomaly_info['power']:.2f} dB")
                 if 'distance' in anomaly_info:
-                    self.stdscr.addstr(12, 2, f"Distance: {anomaly_info['distance']} feet")
+                    put(12, 2, f"Distance: {anomaly_info['distance']} feet")
                 if 'signal_increase' in anomaly_info:
-                    self.stdscr.addstr(13, 2, f"Signal Increase: {anomaly_info['signal_increase']:.1f}%")
+                    put(13, 2, f"Signal Increase: {anomaly_info['signal_increase']:.1f}%")
             else:
-                self.stdscr.addstr(8, 2, "No alerts detected yet")
+                put(8, 2, "No alerts detected yet")
             
             # Early detection area (devices at longer range)
             early_y = 7
-            early_x = width // 2 + 2
-            self.stdscr.addstr(early_y, early_x, "=== Early Detection ===")
+            early_x = layout['early_x']
             if DASHBOARD['early_detection']:
                 early_info = DASHBOARD['early_detection']
                 # Use yellow for early detection text
@@ -257,84 +636,109 @@ class RFIntrusionDetector:
                     except:
                         pass
                 
-                self.stdscr.addstr(early_y + 1, early_x, f"Type: {early_info.get('type', 'Unknown')}", attr)
-                self.stdscr.addstr(early_y + 2, early_x, f"Time: {DASHBOARD['early_detection_time']}", attr)
+                put(early_y + 1, early_x, f"Type: {early_info.get('type', 'Unknown')}", attr)
+                put(early_y + 2, early_x, f"Time: {DASHBOARD['early_detection_time']}", attr)
                 if 'frequency' in early_info:
-                    self.stdscr.addstr(early_y + 3, early_x, f"Frequency: {early_info['frequency']} MHz", attr)
+                    put(early_y + 3, early_x, f"Frequency: {early_info['frequency']} MHz", attr)
                 if 'power' in early_info:
-                    self.stdscr.addstr(early_y + 4, early_x, f"Signal: {early_info['power']:.2f} dB", attr)
+                    put(early_y + 4, early_x, f"Signal: {early_info['power']:.2f} dB", attr)
                 if 'distance' in early_info:
-                    self.stdscr.addstr(early_y + 5, early_x, f"Est. Distance: ~{early_info['distance']} feet", attr)
+                    put(early_y + 5, early_x, f"Est. Distance: ~{early_info['distance']} feet", attr)
                 if 'signal_increase' in early_info:
-                    self.stdscr.addstr(early_y + 6, early_x, f"Signal Increase: {early_info['signal_increase']:.1f}%", attr)
+                    put(early_y + 6, early_x, f"Signal Increase: {early_info['signal_increase']:.1f}%", attr)
             else:
-                self.stdscr.addstr(early_y + 1, early_x, "No devices detected at extended range")
+                put(early_y + 1, early_x, "No devices detected at extended range")
             
             # Signal meter (with dB value)
-            signal_meter_width = 20
+            signal_meter_width = SIGNAL_METER_WIDTH
             signal_level = DASHBOARD.get('signal_level', 0.1)
             meter_fill = int(signal_level * signal_meter_width)
             
             # Create a gradient colored meter (goes from blue to red based on intensity)
-            meter_str = "["
-            for i in range(signal_meter_width):
-                if i < meter_fill:
-                    char = "#"
-                else:
-                    char = " "
-                meter_str += char
-            meter_str += "]"
+            meter_str = "[" + "#" * min(meter_fill, signal_meter_width) + " " * max(signal_meter_width - meter_fill, 0) + "]"
             
             # Try to display signal in dB if available
             signal_db = DASHBOARD.get('signal_db', -120)
             signal_str = f"Signal: {signal_db:.1f} dB "
             
-            self.stdscr.addstr(12, width - len(meter_str) - len(signal_str) - 2, signal_str)
+            put(12, layout['meter_x'] - len(signal_str), signal_str)
             
-            # Set colors for meter if possible
+            # Bold meter for medium and high signal levels if colors are available
+            meter_attr = curses.A_NORMAL
             try:
-                if curses.has_colors():
-                    if signal_level < 0.3:
-                        # Low - blue
-                        self.stdscr.addstr(12, width - len(meter_str) - 2, meter_str)
-                    elif signal_level < 0.6:
-                        # Medium - yellow/white
-                        self.stdscr.addstr(12, width - len(meter_str) - 2, meter_str, curses.A_BOLD)
-                    else:
-                        # High - red (removed blinking)
-                        self.stdscr.addstr(12, width - len(meter_str) - 2, meter_str, curses.A_BOLD)
-                else:
-                    self.stdscr.addstr(12, width - len(meter_str) - 2, meter_str)
+                if curses.has_colors() and signal_level >= 0.3:
+                    meter_attr = curses.A_BOLD
             except:
-                # Fall back to basic display if colors fail
-                self.stdscr.addstr(12, width - len(meter_str) - 2, meter_str)
+                pass
+            put(12, layout['meter_x'], meter_str, meter_attr)
             
-            # Monitoring log
-            log_y = 14
-            self.stdscr.addstr(log_y, 2, "=== Monitoring Log ===")
-            log_y += 1
+            # Monitoring log (entries are clipped to the window by addnstr)
+            log_y = 15
             for i, log_entry in enumerate(DASHBOARD['monitoring_log']):
                 if log_y + i < height - 3:  # Leave space for error log
-                    self.stdscr.addstr(log_y + i, 2, log_entry[:width-4])
+                    put(log_y + i, 2, log_entry)
             
             # Error log
             error_y = height - 3 - len(DASHBOARD['error_log']) - 1
             if error_y > log_y + len(DASHBOARD['monitoring_log']) + 1:
-                self.stdscr.addstr(error_y, 2, "=== Error Log ===")
+                put(error_y, 2, "=== Error Log ===")
                 error_y += 1
                 for i, error_entry in enumerate(DASHBOARD['error_log']):
                     if error_y + i < height - 2:
-                        self.stdscr.addstr(error_y + i, 2, error_entry[:width-4], curses.A_BOLD)
+                        put(error_y + i, 2, error_entry, curses.A_BOLD)
             
-            # Instructions
-            self.stdscr.addstr(height-1, 2, "Press 'q' to exit, 'r' to reset baseline, 'l' to view logs")
+            # Repaint changed rows, and blank rows that no longer have content
+            for y in set(self._last_rendered) - set(rows):
+                self.draw_dashboard_row(y, [], height, width)
+            for y, segments in rows.items():
+                self.draw_dashboard_row(y, segments, height, width)
             
-            # Refresh the screen
-            self.stdscr.refresh()
+            # Push all changes to the terminal in one update
+            self.stdscr.noutrefresh()
+            curses.doupdate()
         except Exception as e:
             # Fall back to regular console output if curses fails
             print(f"Dashboard error: {e}")
     
+    def draw_dashboard_row(self, y, segments, height, width):
+        """Repaint a single dashboard row if its content changed since the last draw"""
+        if self._last_rendered.get(y, []) == segments:
+            return
+        self._last_rendered[y] = segments
+        
+        # Clear the row, keeping the border intact
+        if y == 0 or y == height - 1:
+            self.stdscr.hline(y, 1, curses.ACS_HLINE, width - 2)
+        else:
+            self.stdscr.move(y, 1)
+            self.stdscr.clrtoeol()
+            self.stdscr.addch(y, width - 1, curses.ACS_VLINE)
+        
+        # Clip each segment to the space left before the right border
+        for x, text, attr in segments:
+            self.stdscr.addnstr(y, x, text, max(width - 2 - x, 0), attr)
+    
+    def compute_dashboard_layout(self, height, width):
+        """Work out the dashboard positions that only change with the terminal size"""
+        title = "RF Intrusion Detection System"
+        instructions = "Press 'q' to exit, 'r' to reset baseline, 'l' to view logs"
+        early_x = width // 2 + 2
+        # "[|] Active - HH:MM:SS" and the signal meter have a fixed width
+        active_len = len("[|] Active - 00:00:00")
+        meter_len = SIGNAL_METER_WIDTH + 2
+        return {
+            'labels': [
+                (0, (width - len(title)) // 2, title),
+                (7, 2, "=== Last Alert ==="),
+                (7, early_x, "=== Early Detection ==="),
+                (14, 2, "=== Monitoring Log ==="),
+                (height - 1, 2, instructions),
+            ],
+            'active_x': width - active_len - 2,
+            'early_x': early_x,
+            'meter_x': width - meter_len - 2,
+        }
+    
     def draw_log_viewer(self):
         """Draw the log viewer screen"""
         try:
@@ -347,6 +751,10 @@ class RFIntrusionDetector:
             # Clear screen
             self.stdscr.clear()
             
+            # The dashboard has to be repainted from scratch after this
+            self._rendered_size = None
+            self._viewer_drawn_at = int(time.time())
+            
             # Draw border
             self.stdscr.border()
             
@@ -361,13 +769,12 @@ class RFIntrusionDetector:
             self.stdscr.addstr(2, 2, log_type_str)
             
             # Current time
-            current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            current_time = _now_str()
             time_str = f"Time: {current_time}"
             self.stdscr.addstr(2, width - len(time_str) - 2, time_str)
             
             # Page indicator
-            total_pages = max(1, (len(DASHBOARD['log_entries']) + LOG_ENTRIES_PER_PAGE - 1) // LOG_ENTRIES_PER_PAGE)
-            page_str = f"Page {DASHBOARD['log_page'] + 1}/{total_pages}"
+            page_str = f"Page {DASHBOARD['log_page'] + 1}/{DASHBOARD['total_pages']}"
             self.stdscr.addstr(3, 2, page_str)
             
             # Column headers
@@ -387,7 +794,7 @@ class RFIntrusionDetector:
             start_idx = DASHBOARD['log_page'] * LOG_ENTRIES_PER_PAGE
             end_idx = min(start_idx + LOG_ENTRIES_PER_PAGE, len(DASHBOARD['log_entries']))
             
-            for i, entry in enumerate(DASHBOARD['log_entries'][start_idx:end_idx]):
+            for i, entry in enumerate(islice(DASHBOARD['log_entries'], start_idx, end_idx)):
                 row_y = 7 + i
                 
                 if row_y < height - 2:
@@ -436,59 +843,160 @@ class RFIntrusionDetector:
         log_type_idx = DASHBOARD.get('log_type', 0)
         entries = []
         
+        # Make sure buffered rows are on disk before reading them back
+        self.flush_log_buffers()
+        
         try:
             if log_type_idx == 0:  # Anomaly log
-                if os.path.exists(self.enhanced_log_file):
-                    with open(self.enhanced_log_file, 'r', newline='') as f:
-                        reader = csv.reader(f)
-                        next(reader)  # Skip header
-                        entries = list(reader)
+                log_path = self.enhanced_log_file
             else:  # Proximity log
-                if os.path.exists(self.proximity_log_file):
-                    with open(self.proximity_log_file, 'r', newline='') as f:
-                        reader = csv.reader(f)
-                        next(reader)  # Skip header
-                        entries = list(reader)
-                        
-            # Sort entries by timestamp (newest first)
-            entries.sort(key=lambda x: x[0], reverse=True)
+                log_path = self.proximity_log_file
+            
+            try:
+                entries = self.read_log_file(log_type_idx, log_path)
+            except FileNotFoundError:
+                pass  # Nothing logged yet
         except Exception as e:
             print(f"Error loading log entries: {e}")
             entries = [["Error loading log entries", str(e)]]
         
         DASHBOARD['log_entries'] = entries
+        DASHBOARD['total_pages'] = max(1, (len(entries) + LOG_ENTRIES_PER_PAGE - 1) // LOG_ENTRIES_PER_PAGE)
         DASHBOARD['log_page'] = 0  # Reset to first page
     
+    def create_log_file(self, path, header):
+        """Create a CSV log file with its header row, leaving an existing one untouched"""
+        # Exclusive create: one open() instead of an exists() check followed by it
+        try:
+            with open(path, 'x', newline='') as f:
+                csv.writer(f).writerow(header)
+        except FileExistsError:
+            pass
+    
+    def read_log_file(self, log_type_idx, log_path):
+        """Return a log's rows newest first, only parsing what was appended since the last read"""
+        mtime = os.stat(log_path).st_mtime
+        cached_mtime, offset, entries = self._log_cache.get(
+            log_type_idx, (None, 0, deque(maxlen=MAX_VIEWER_ENTRIES)))
+        if mtime == cached_mtime:
+            return entries
+        
+        with open(log_path, 'rb') as f:
+            # Start over if the file was truncated or replaced
+            if f.seek(0, os.SEEK_END) < offset:
+                offset, entries = 0, deque(maxlen=MAX_VIEWER_ENTRIES)
+            f.seek(offset)
+            data = f.read()
+        
+        # Only consume complete lines, a partial row is picked up next time
+        data = data[:data.rfind(b'\n') + 1]
+        new_rows = list(csv.reader(data.decode('utf-8').splitlines()))
+        if offset == 0 and new_rows:
+            new_rows = new_rows[1:]  # Skip header
+        offset += len(data)
+        
+        # Rows are appended in time order, so pushing each one onto the front
+        # keeps the entries newest first without sorting (the bounded deque
+        # drops the oldest rows off the back)
+        entries.extendleft(new_rows)
+        
+        self._log_cache[log_type_idx] = (mtime, offset, entries)
+        return entries
+    
+    def _init_sdr(self):
+        """Open the RTL-SDR, only sending the sample rate and gain where they differ"""
+        self.sdr = RtlSdr()
+        sample_rate = self.config['sample_rate']
+        if self.sdr.sample_rate != sample_rate:
+            self.sdr.sample_rate = sample_rate
+        # 'auto' switches the tuner's gain mode, which the gain readback can't tell us
+        gain = self.config['gain']
+        if gain == 'auto' or self.sdr.gain != gain:
+            self.sdr.gain = gain
+    
+    def sdr_healthy(self):
+        """Whether the open RTL-SDR still delivers samples, i.e. an error can be recovered
+        from without reopening (and re-enumerating) the device"""
+        # librtlsdr's synchronous read can block indefinitely on a wedged device, so the
+        # probe runs on its own thread and one that hasn't answered in time counts as
+        # failed. A probe still stuck from last time also counts, without starting another
+        if self.sdr_probe_pending():
+            return False
+        ok = []
+        def probe(sdr=self.sdr):
+            try:
+                sdr.read_bytes(512)
+                ok.append(True)
+            except Exception:
+                pass
+        prober = self._sdr_probe = threading.Thread(target=probe, name='rf-ids-sdr-probe', daemon=True)
+        prober.start()
+        prober.join(timeout=SDR_PROBE_TIMEOUT)
+        return bool(ok)
+    
+    def sdr_probe_pending(self, timeout=0.0):
+        """Whether a timed-out health probe is still inside a read on the RTL-SDR after
+        waiting up to timeout seconds for it - the device must not be closed under it"""
+        prober = self._sdr_probe
+        if prober is None:
+            return False
+        prober.join(timeout)
+        if prober.is_alive():
+            return True
+        self._sdr_probe = None
+        return False
+    
+    def get_device_id(self):
+        """Hash the serials of the attached RTL-SDR devices and the open one's tuner
+        (None if unavailable)"""
+        try:
+            serials = RtlSdr.get_device_serial_addresses()
+        except Exception:
+            return None
+        if not serials:
+            return None
+        # Most dongles ship with serial 00000001, so the tuner type and its gain
+        # table tell e.g. an R820T from an E4000 with the same serial
+        try:
+            tuner = self.sdr.get_tuner_type()
+        except Exception:
+            tuner = None
+        try:
+            gains = self.sdr.get_gains()
+        except Exception:
+            gains = None
+        ident = f"{','.join(str(s) for s in serials)};{tuner};{gains}"
+        return hashlib.sha1(ident.encode()).hexdigest()
+    
     def test_max_frequency(self):
         """Test the maximum frequency this RTL-SDR can handle"""
         self.update_dashboard(status="Testing maximum frequency capability...", 
                              log_message="Testing RTL-SDR frequency range")
         
-        # Test frequencies in descending order (MHz)
-        test_freqs = [1700, 1500, 1200, 1000, 900, 800, 700, 600, 500, 400, 300, 200, 100, 50]
+        # Test frequencies in ascending order (MHz); binary search for the highest
+        # one that tunes, assuming everything below a working frequency also works
+        test_freqs = sorted([1700, 1500, 1200, 1000, 900, 800, 700, 600, 500, 400, 300, 200, 100, 50])
         
         max_freq = 0
-        # Save current stderr to suppress error messages during testing
-        old_stderr = sys.stderr
-        try:
-            for freq in test_freqs:
+        lo, hi = 0, len(test_freqs) - 1
+        # Suppress tuner error messages for the whole probe with a single devnull handle
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stderr(devnull):
+            while lo <= hi:
+                mid = (lo + hi) // 2
+                freq = test_freqs[mid]
                 freq_hz = freq * 1e6
                 try:
-                    # Redirect stderr to null to hide error messages
-                    sys.stderr = open(os.devnull, 'w')
                     self.sdr.center_freq = freq_hz
-                    # Read a small number of samples to verify tuning worked
-                    self.sdr.read_samples(1024)
+                    # Read a small number of samples to verify tuning worked (raw
+                    # bytes - the probe never looks at them, so skip the conversion)
+                    self.sdr.read_bytes(2 * 1024)
                     # If we reach here without error, the frequency is supported
                     max_freq = freq_hz
-                    sys.stderr = old_stderr
                     self.update_dashboard(log_message=f"Successfully tuned to {freq} MHz")
-                    break
+                    lo = mid + 1
                 except Exception as e:
-                    sys.stderr = old_stderr
                     self.update_dashboard(log_message=f"Cannot tune to {freq} MHz", error=True)
-        finally:
-            sys.stderr = old_stderr
+                    hi = mid - 1
             
         if max_freq == 0:
             self.update_dashboard(status="Could not determine maximum frequency", 
@@ -519,11 +1027,51 @@ class RFIntrusionDetector:
                 if freq * 1e6 <= max_freq:
                     valid_freqs.append(freq)
         
-        self.config['frequencies'] = valid_freqs
+        self.set_frequencies(valid_freqs)
         
-        # Save updated config
-        with open('config.json', 'w') as f:
-            json.dump(self.config, f, indent=4)
+        # Save updated config (also persists the cached device capabilities)
+        self._config_dirty = True
+        self.save_config()
+    
+    def set_frequencies(self, frequencies):
+        """Replace the monitored frequencies (MHz), keeping their tuner values in Hz alongside"""
+        self.config['frequencies'] = frequencies
+        self._freqs_hz = [freq * 1e6 for freq in frequencies]
+    
+    def save_config(self):
+        """Write the configuration back to config.json if it has unsaved changes"""
+        if not self._config_dirty:
+            return
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            data = json.dumps(self.config, indent=2).encode()
+        
+        # Leave config.json alone if it already holds exactly this (the common
+        # case at startup), sparing the SD card a rewrite
+        try:
+            with open('config.json', 'rb') as f:
+                unchanged = f.read() == data
+        except OSError:
+            unchanged = False
+        
+        if not unchanged:
+            # Write a temp file and rename it over the original, so an interrupted
+            # save can never leave a truncated config behind
+            tmp_file = 'config.json.tmp'
+            with open(tmp_file, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_file, 'config.json')
+        self._config_dirty = False
+        self._last_config_save = time.monotonic()
+    
+    def maybe_save_config(self):
+        """Save pending config changes unless the last save was under CONFIG_SAVE_INTERVAL ago"""
+        if self._config_dirty and time.monotonic() - self._last_config_save >= CONFIG_SAVE_INTERVAL:
+            try:
+                self.save_config()
+            except OSError as e:
+                self.update_dashboard(log_message=f"Error saving configuration: {e}", error=True)
     
     def setup_initial_config(self):
         """Interactive setup for first-time configuration"""
@@ -541,24 +1089,67 @@ class RFIntrusionDetector:
             self.update_dashboard(log_message=f"Configuration file not found: {config_file}")
             self.config = self.setup_initial_config()
     
+    def _init_spectrum_buffers(self):
+        """Precompute the Welch window, frequency grid and scratch buffers for capture_spectrum"""
+        fft_size = self.config['fft_size']
+        
+        # Same window, overlap and density scaling that signal.welch uses by default
+        self._window = signal.get_window('hann', fft_size).astype(np.float32)
+        win_norm = float(np.sum(self._window.astype(np.float64) ** 2))
+        # Density scaling 1/(fs*sum(w^2)), applied as an offset to the dB values
+        self._psd_scale_db = -10 * math.log10((self.sdr.sample_rate / 1e6) * win_norm)
+        self._seg_step = fft_size - fft_size // 2
+        
+        # Two-sided frequency grid (complex I/Q input) in welch's FFT order
+        self._fft_freqs = np.fft.fftfreq(fft_size, d=1.0 / (self.sdr.sample_rate / 1e6))
+        self._freq_grids = {}  # Tuned frequency (Hz) -> centered frequency grid (MHz)
+        
+        n_seg = (self.config['num_samples'] - fft_size // 2) // self._seg_step
+        # Scratch buffers are single precision - the samples are only 8-bit I/Q
+        self._seg = np.empty((max(n_seg, 1), fft_size), dtype=np.complex64)
+        self._psd_accum = np.zeros(fft_size, dtype=np.float32)
+        # Interleaved I/Q floats for the signal meter, reused across scans
+        self._meter_iq = np.empty(2 * METER_SAMPLES, dtype=np.float32)
+        self._meter_idle_levels = cycle(METER_IDLE_LEVELS)
+        # Converted capture samples, reused across scans
+        self._sample_buf = np.empty(self.config['num_samples'], dtype=np.complex64)
+    
     def capture_spectrum(self):
         """Capture RF spectrum data"""
         try:
-            samples = self.sdr.read_samples(self.config['num_samples'])
-            
-            # Compute power spectral density
-            frequencies, psd = signal.welch(
-                samples, 
-                fs=self.sdr.sample_rate/1e6, 
-                nperseg=self.config['fft_size'],
-                scaling='density'
-            )
-            
-            # Convert to dB
-            psd_db = 10 * np.log10(psd)
-            
-            # Center the frequencies
-            frequencies = frequencies + (self.sdr.center_freq/1e6 - self.sdr.sample_rate/2e6)
+            # Raw 8-bit I/Q scaled to +/-1.0 straight into the reused complex64
+            # sample buffer, instead of the fresh complex128 array read_samples returns
+            raw = np.frombuffer(self.sdr.read_bytes(2 * self._sample_buf.size), dtype=np.uint8)
+            samples = self._sample_buf[:raw.size // 2]
+            _u8_to_iq(raw, samples.view(np.float32))
+            fft_size = self.config['fft_size']
+            
+            # 50% overlapping segments, as many as fit in the samples
+            n_seg = (samples.size - fft_size) // self._seg_step + 1
+            if n_seg > self._seg.shape[0]:
+                self._seg = np.empty((n_seg, fft_size), dtype=np.complex64)
+            seg = self._seg[:n_seg]
+            
+            # Remove each segment's mean (welch's default 'constant' detrend) and window it
+            _window_segments(samples, self._window, self._seg_step, seg)
+            
+            # Average the periodograms of all segments into the accumulator; scipy's
+            # pocketfft keeps complex64 in single precision and can overwrite the
+            # scratch segments, and workers=-1 spreads the segments over all cores
+            spectrum = scipy_fft.fft(seg, axis=1, overwrite_x=True, workers=-1)
+            _mean_power(spectrum, self._psd_accum)
+            
+            # Convert to dB, applying the density scaling as a dB offset in the same
+            # pass (a fresh array - callers keep spectra between scans)
+            psd_db = _power_to_db(self._psd_accum, self._psd_scale_db)
+            
+            # Center the frequencies - the grid only depends on the tuned frequency
+            # and is never modified, so each one is built once and shared
+            center_freq = self.sdr.center_freq
+            frequencies = self._freq_grids.get(center_freq)
+            if frequencies is None:
+                frequencies = self._fft_freqs + (center_freq/1e6 - self.sdr.sample_rate/2e6)
+                self._freq_grids[center_freq] = frequencies
             
             return frequencies, psd_db
         except Exception as e:
@@ -585,6 +1176,11 @@ class RFIntrusionDetector:
                 self.baseline = pickle.load(f)
             self.update_dashboard(log_message=f"Loaded baseline from {self.baseline_file}")
             self.update_dashboard(log_message=f"Baseline created on: {self.baseline['timestamp']}")
+            
+            # Convert baseline spectra to contiguous float32 arrays once so the
+            # scoring kernel doesn't have to box or copy them on every scan
+            for freq_data in self.baseline.get('data', {}).values():
+                freq_data['psd_mean'] = np.ascontiguousarray(freq_data['psd_mean'], dtype=np.float32)
             return True
         except Exception as e:
             self.update_dashboard(log_message=f"Error loading baseline: {e}", error=True)
@@ -598,17 +1194,20 @@ class RFIntrusionDetector:
         pass
     
     def estimate_distance(self, current_power, baseline_power, freq_mhz):
-        """Estimate distance based on signal strength using FSPL model"""
+        """Estimate distance based on signal strength using FSPL model
+        
+        Accepts scalars or NumPy arrays of power bins; returns an array of
+        distances in feet with NaN wherever the signal is not above baseline.
+        """
         # Free Space Path Loss formula: FSPL(dB) = 20*log10(d) + 20*log10(f) + 20*log10(4π/c)
         # where d is distance in meters, f is frequency in Hz, c is speed of light
+        current_power = np.asarray(current_power, dtype=np.float32)
+        baseline_power = np.asarray(baseline_power, dtype=np.float32)
+        freq_mhz = np.asarray(freq_mhz, dtype=np.float32)
         
         # Calculate signal strength difference
         power_diff = current_power - baseline_power
         
-        # If power is less than baseline, not approaching
-        if power_diff <= 0:
-            return None
-        
         # Simplified distance estimation based on RF principles
         # In free space, doubling distance reduces power by 6dB
         # We use baseline as a reference point and assume it's at ~50 feet
@@ -616,254 +1215,233 @@ class RFIntrusionDetector:
         
         # Calculate distance based on 6dB rule (each 6dB increase = half the distance)
         # power_diff = 10 * log10(d_ref^2 / d^2) for free space
-        distance = reference_distance / (10 ** (power_diff / 20.0))
+        distance = reference_distance / np.power(np.float32(10.0), power_diff / np.float32(20.0))
         
         # Apply frequency-based correction (higher freq = shorter range)
         # This is a simple approximation
-        freq_factor = 1.0
-        if freq_mhz >= 800:
-            freq_factor = 0.7  # Higher frequencies attenuate faster
-        elif freq_mhz >= 400:
-            freq_factor = 0.85
-            
-        distance *= freq_factor
+        distance *= _freq_factor(freq_mhz)
         
         # Constrain distance to reasonable values
-        if distance < 1:
-            distance = 1
-        if distance > 100:
-            distance = 100
-            
-        return round(distance, 1)
+        distance = np.round(np.clip(distance, 1, 100), 1)
+        
+        # If power is less than baseline, not approaching
+        return np.where(power_diff > 0, distance, np.nan)
+    
+    def get_freq_factor(self, current_freq, frequencies):
+        """Distance correction per PSD bin, computed once per center frequency"""
+        # The bin grid only depends on the center frequency, so this is fixed per sweep step
+        freq_factor = self._freq_factor_cache.get(current_freq)
+        if freq_factor is None or freq_factor.shape != frequencies.shape:
+            freq_factor = _freq_factor(frequencies)
+            self._freq_factor_cache[current_freq] = freq_factor
+        return freq_factor
     
     def calculate_signal_increase(self, current_power, baseline_power):
-        """Calculate percentage increase in signal strength"""
-        # Convert from dB to linear power ratio
-        current_linear = 10 ** (current_power / 10)
-        baseline_linear = 10 ** (baseline_power / 10)
+        """Calculate percentage increase in signal strength
+        
+        Accepts scalars or NumPy arrays of power bins and returns the same shape;
+        scalars are answered in plain floats without going through NumPy.
+        """
+        if np.ndim(current_power) == 0 and np.ndim(baseline_power) == 0:
+            return _signal_increase_scalar(float(current_power), float(baseline_power))
+        return _signal_increase_vec(current_power, baseline_power)
+    
+    def init_proximity_refs(self):
+        """Precompute the proximity thresholds per calibrated frequency from the config"""
+        self._proximity_refs = {}
+        prox_cfg = self.config.get('proximity_detection', {})
         
-        # Calculate percentage increase
-        if baseline_linear <= 0:
-            return 0.0
+        # Nothing to check unless enabled and calibrated
+        if not prox_cfg.get('enabled', False) or prox_cfg.get('calibration_needed', True):
+            return
+        calibration_values = prox_cfg.get('calibration_values', {})
+        if not calibration_values:
+            return
         
-        increase = ((current_linear - baseline_linear) / baseline_linear) * 100
+        # In RF, power drops with square of distance, so double distance = 1/4 power = -6 dB
+        extended_range_factor = -6  # dB reduction for double the distance
         
-        # Clip to reasonable values
-        if increase < 0:
-            increase = 0.0
-        if increase > 10000:  # Cap at 10,000% to avoid huge numbers
-            increase = 10000.0
-            
-        return increase
+        for device_type, freq_key, power_key, distance_key, label in PROXIMITY_CHECKS:
+            freq = calibration_values.get(freq_key)
+            ref_power = calibration_values.get(power_key)
+            distance = prox_cfg.get(distance_key)
+            # Skip checks whose calibration or distance setting is missing
+            if freq is None or ref_power is None or distance is None:
+                continue
+            self._proximity_refs.setdefault(freq, []).append((
+                device_type, f"{device_type}_{freq}", ref_power,
+                ref_power + extended_range_factor, distance, label
+            ))
+    
+    def _emit_early(self, early, timestamp, log_message, _dash=DASHBOARD):
+        """Publish an early detection to the dashboard with a single log update"""
+        _dash['early_detection'] = early
+        _dash['early_detection_time'] = timestamp
+        self.update_dashboard(log_message=log_message)
     
     def check_proximity_breach(self, current_freq, current_psd):
         """Check if a device is too close based on signal strength using limited frequency range"""
-        global DASHBOARD
-        
-        if not self.config.get('proximity_detection', {}).get('enabled', False):
-            return False
-        
-        # Skip if not calibrated
-        if self.config.get('proximity_detection', {}).get('calibration_needed', True):
-            return False
-        
-        # Get calibrated values
-        calibration_values = self.config['proximity_detection'].get('calibration_values', {})
-        if not calibration_values:
+        # Device types calibrated on this frequency, see init_proximity_refs
+        checks = self._proximity_refs.get(current_freq)
+        if not checks:
             return False
         
-        # Check for wireless device (Bluetooth proxy)
-        is_wireless_proxy = (current_freq == calibration_values.get('wireless_freq'))
-        
-        # Check for cellular
-        is_cellular_proxy = (current_freq == calibration_values.get('cellular_freq'))
-        
-        if not (is_wireless_proxy or is_cellular_proxy):
+        # Get max power (as a Python float, so the comparisons below stay cheap)
+        peak_idx = int(current_psd.argmax())
+        max_power = float(current_psd[peak_idx])
+
+        # Nothing to track or log unless the peak clears a matching device's extended threshold
+        if max_power <= min(check[3] for check in checks):
             return False
-        
-        # Get max power
-        max_power = np.max(current_psd)
-        
-        # Calculate extended range thresholds
-        # In RF, power drops with square of distance, so double distance = 1/4 power = -6 dB
-        extended_range_factor = -6  # dB reduction for double the distance
-        
+
         # Current timestamp
-        now = datetime.datetime.now()
-        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = _now_str()
+        tracker = self.anomaly_tracker
+        log_detection = self.log_proximity_detection
         
-        # Check wireless device breach
-        if is_wireless_proxy:
-            ref_power = calibration_values.get('wireless_power')
-            distance = self.config['proximity_detection']['bluetooth_distance_threshold']
-            
+        for device_type, device_key, ref_power, extended_ref, distance, label in checks:
             # Check for extended range detection (at 2x the distance)
-            extended_ref = ref_power + extended_range_factor
+            if max_power > ref_power:
+                status = 'alert'
+            elif max_power > extended_ref:
+                status = 'early_detection'
+            else:
+                continue
             
             # Calculate signal increase percentage
-            signal_increase = self.calculate_signal_increase(max_power, extended_ref)
+            signal_increase = _signal_increase_scalar(max_power, extended_ref)
             
-            # Update device tracking for wireless devices
-            device_key = f"wireless_{current_freq}"
-            
-            if max_power > extended_ref and max_power <= ref_power:
+            if status == 'early_detection':
                 # This is an early detection - store it but don't trigger alert
-                early_detection = {
-                    'type': 'wireless',
+                self._emit_early({
+                    'type': device_type,
                     'distance': distance * 2,  # Double the distance
                     'power': max_power,
                     'reference': extended_ref,
                     'frequency': current_freq,
                     'alert_level': 'early',
                     'signal_increase': signal_increase
-                }
-                DASHBOARD['early_detection'] = early_detection
-                DASHBOARD['early_detection_time'] = timestamp
-                self.update_dashboard(log_message=f"Early detection: Wireless device at ~{distance*2} feet")
-                
-                # Track this device for logging
-                if device_key not in self.anomaly_tracker:
-                    self.anomaly_tracker[device_key] = {
-                        'first_seen': timestamp,
-                        'last_seen': timestamp,
-                        'status': 'early_detection'
-                    }
-                else:
-                    self.anomaly_tracker[device_key]['last_seen'] = timestamp
-                    self.anomaly_tracker[device_key]['status'] = 'early_detection'
-                
-                # Log this early detection
-                self.log_proximity_detection(
-                    device_key, 'wireless', current_freq, max_power, 
-                    distance * 2, 'early_detection'
-                )
-            
-            # Check for actual alert threshold
-            if max_power > ref_power:
-                # Update device tracking for proximity alerts
-                if device_key not in self.anomaly_tracker:
-                    self.anomaly_tracker[device_key] = {
-                        'first_seen': timestamp,
-                        'last_seen': timestamp,
-                        'status': 'alert'
-                    }
-                else:
-                    self.anomaly_tracker[device_key]['last_seen'] = timestamp
-                    self.anomaly_tracker[device_key]['status'] = 'alert'
-                
-                # Log this proximity alert
-                self.log_proximity_detection(
-                    device_key, 'wireless', current_freq, max_power, 
-                    distance, 'alert'
-                )
-                
-                return {
-                    'type': 'wireless',
-                    'distance': distance,
-                    'power': max_power,
-                    'reference': ref_power,
-                    'frequency': current_freq,
-                    'alert_level': 'alert',
-                    'signal_increase': signal_increase
-                }
-        
-        # Check cellular breach
-        if is_cellular_proxy:
-            ref_power = calibration_values.get('cellular_power')
-            distance = self.config['proximity_detection']['cellular_distance_threshold']
-            
-            # Check for extended range detection (at 2x the distance)
-            extended_ref = ref_power + extended_range_factor
+                }, timestamp, f"Early detection: {label} at ~{distance*2} feet")
             
-            # Calculate signal increase percentage
-            signal_increase = self.calculate_signal_increase(max_power, extended_ref)
-            
-            # Update device tracking for cellular devices
-            device_key = f"cellular_{current_freq}"
+            # Track this device for logging
+            track = tracker.get(device_key)
+            if track is None:
+                tracker[device_key] = _Track(timestamp, timestamp, status)
+            else:
+                track.last_seen = timestamp
+                track.status = status
             
-            if max_power > extended_ref and max_power <= ref_power:
-                # This is an early detection - store it but don't trigger alert
-                early_detection = {
-                    'type': 'cellular',
-                    'distance': distance * 2,  # Double the distance
-                    'power': max_power,
-                    'reference': extended_ref,
-                    'frequency': current_freq,
-                    'alert_level': 'early',
-                    'signal_increase': signal_increase
-                }
-                DASHBOARD['early_detection'] = early_detection
-                DASHBOARD['early_detection_time'] = timestamp
-                self.update_dashboard(log_message=f"Early detection: Cell phone at ~{distance*2} feet")
-                
-                # Track this device for logging
-                if device_key not in self.anomaly_tracker:
-                    self.anomaly_tracker[device_key] = {
-                        'first_seen': timestamp,
-                        'last_seen': timestamp,
-                        'status': 'early_detection'
-                    }
-                else:
-                    self.anomaly_tracker[device_key]['last_seen'] = timestamp
-                    self.anomaly_tracker[device_key]['status'] = 'early_detection'
-                
-                # Log this early detection
-                self.log_proximity_detection(
-                    device_key, 'cellular', current_freq, max_power, 
-                    distance * 2, 'early_detection'
-                )
+            # Log this detection
+            log_detection(
+                device_key, device_type, current_freq, max_power, 
+                distance if status == 'alert' else distance * 2, status
+            )
             
-            # Check for actual alert threshold
-            if max_power > ref_power:
-                # Update device tracking for proximity alerts
-                if device_key not in self.anomaly_tracker:
-                    self.anomaly_tracker[device_key] = {
-                        'first_seen': timestamp,
-                        'last_seen': timestamp,
-                        'status': 'alert'
-                    }
-                else:
-                    self.anomaly_tracker[device_key]['last_seen'] = timestamp
-                    self.anomaly_tracker[device_key]['status'] = 'alert'
-                
-                # Log this proximity alert
-                self.log_proximity_detection(
-                    device_key, 'cellular', current_freq, max_power, 
-                    distance, 'alert'
-                )
-                
+            if status == 'alert':
                 return {
-                    'type': 'cellular',
+                    'type': device_type,
                     'distance': distance,
                     'power': max_power,
                     'reference': ref_power,
                     'frequency': current_freq,
                     'alert_level': 'alert',
-                    'signal_increase': signal_increase
+                    'signal_increase': signal_increase,
+                    'index': peak_idx  # PSD bin of the peak, for plotting
                 }
         
         return False
     
+    def track_anomalies(self, center_freq, anomaly_freqs, powers, now):
+        """Record spectral anomaly hits and return each one's first-seen time as a string"""
+        # Canonical id per (center frequency, anomaly frequency) at kHz resolution
+        keys = (int(round(center_freq * 1000)) * ANOMALY_KEY_STRIDE
+                + np.rint(np.asarray(anomaly_freqs, dtype=np.float64) * 1000).astype(np.int64))
+        powers = np.asarray(powers, dtype=np.float32)
+        now = np.datetime64(now, 's')
+        
+        # Forget anomalies that have not been seen for longer than the maximum age
+        max_age = self.config.get('anomaly_max_age', 86400)
+        if max_age and self._atk_key.size:
+            keep = (now - self._atk_last) < np.timedelta64(int(max_age), 's')
+            if not keep.all():
+                self._atk_key = self._atk_key[keep]
+                self._atk_first = self._atk_first[keep]
+                self._atk_last = self._atk_last[keep]
+                self._atk_power = self._atk_power[keep]
+        
+        uniq, first_idx, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        pos = np.searchsorted(self._atk_key, uniq)
+        seen = pos < self._atk_key.size
+        seen[seen] = self._atk_key[pos[seen]] == uniq[seen]
+        
+        # Known anomalies are updated in place
+        self._atk_last[pos[seen]] = now
+        self._atk_power[pos[seen]] = powers[first_idx[seen]]
+        
+        # New ones are inserted at their sorted positions
+        new = ~seen
+        if new.any():
+            self._atk_key = np.insert(self._atk_key, pos[new], uniq[new])
+            self._atk_first = np.insert(self._atk_first, pos[new], now)
+            self._atk_last = np.insert(self._atk_last, pos[new], now)
+            self._atk_power = np.insert(self._atk_power, pos[new], powers[first_idx[new]])
+            pos = np.searchsorted(self._atk_key, uniq)
+        
+        first_seen = np.datetime_as_string(self._atk_first[pos[inverse]], unit='s')
+        return np.char.replace(first_seen, 'T', ' ').tolist()
+    
     def log_proximity_detection(self, device_key, device_type, frequency, power, distance, status):
         """Log proximity detection to CSV file"""
         try:
             # Get timestamp info
-            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            now = _now_str()
             
             # Get first_seen and last_seen
-            first_seen = self.anomaly_tracker[device_key]['first_seen'] if device_key in self.anomaly_tracker else now
+            track = self.anomaly_tracker.get(device_key)
+            first_seen = track.first_seen if track is not None else now
             last_seen = now
             
-            # Write to proximity log file
-            with open(self.proximity_log_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    now, first_seen, last_seen, device_type, 
-                    frequency, f"{power:.2f}", distance, status
-                ])
+            # Queue for the proximity log file
+            self._prox_buf.append(PROXIMITY_LOG_LINE(
+                now, first_seen, last_seen, device_type, 
+                frequency, power, distance, status
+            ))
+            self.maybe_flush_log_buffers()
         except Exception as e:
             self.update_dashboard(log_message=f"Error logging proximity detection: {e}", error=True)
     
+    def log_anomalies(self, lines):
+        """Queue formatted lines for the enhanced anomaly log"""
+        self._anom_buf.extend(lines)
+        self.maybe_flush_log_buffers()
+    
+    def maybe_flush_log_buffers(self):
+        """Flush buffered log rows if enough are pending or enough time has passed"""
+        pending = len(self._anom_buf) + len(self._prox_buf) + len(self._legacy_buf) + len(self._alert_buf)
+        if pending >= LOG_FLUSH_ROWS or (pending and time.monotonic() - self._last_log_flush >= LOG_FLUSH_INTERVAL):
+            self.flush_log_buffers()
+    
+    def flush_log_buffers(self):
+        """Write all buffered log lines to their files in one burst per file"""
+        for buf, fh in ((self._anom_buf, self._anom_fh), (self._prox_buf, self._prox_fh),
+                        (self._legacy_buf, self._legacy_fh), (self._alert_buf, self._alert_fh)):
+            if not buf:
+                continue
+            try:
+                fh.write("".join(buf))
+                fh.flush()
+                os.fsync(fh.fileno())
+            except Exception as e:
+                self.update_dashboard(log_message=f"Error writing log file {fh.name}: {e}", error=True)
+            buf.clear()
+        self._last_log_flush = time.monotonic()
+    
+    def scan_stride(self):
+        """PSD bin stride for anomaly scoring - coarser the longer nothing has been found"""
+        if not self._adaptive_stride or self._quiet_runs <= 10:
+            return 1
+        return 2 if self._quiet_runs <= 50 else 4
+    
     def scan_for_intrusions(self, current_freq):
         """Scan RF spectrum and detect anomalies"""
         # Check if baseline exists at all
@@ -897,109 +1475,111 @@ class RFIntrusionDetector:
         # First check for proximity breaches (takes priority)
         proximity_breach = self.check_proximity_breach(current_freq, current_psd)
         if proximity_breach:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = _now_str("%Y%m%d_%H%M%S")
             filename = f"proximity_{proximity_breach['type']}_{timestamp}.png"
             
             # Log proximity breach
-            log_file = os.path.join(self.config['output_dir'], 'proximity_alerts.log')
-            with open(log_file, 'a') as f:
-                f.write(f"{timestamp},{proximity_breach['type']},{proximity_breach['distance']},{proximity_breach['power']:.2f},{proximity_breach['frequency']}\n")
+            self._alert_buf.append(f"{timestamp},{proximity_breach['type']},{proximity_breach['distance']},{proximity_breach['power']:.2f},{proximity_breach['frequency']}\n")
+            self.maybe_flush_log_buffers()
             
             # Plot the spectrum showing the breach
-            self.plot_proximity_breach(frequencies, current_psd, proximity_breach, filename)
+            image_bytes = self.plot_proximity_breach(frequencies, current_psd, proximity_breach, filename)
             
             # Alert for proximity breach
-            self.send_proximity_alert(proximity_breach, filename)
+            self.send_proximity_alert(proximity_breach, filename, image_bytes=image_bytes)
             
             # Update dashboard with alert
             self.update_dashboard(alert=proximity_breach)
             
+            self._quiet_runs = 0
             return True
         
         # Get baseline for this frequency
         baseline_data = self.baseline['data'][current_freq]
         baseline_psd = baseline_data['psd_mean']
         
-        # Compare with baseline
-        diff = current_psd - baseline_psd
+        # Compare with baseline - find the bins that exceed the threshold and
+        # score only those for signal increase and estimated distance
+        stride = self.scan_stride()
+        if stride == 1:
+            scan_psd, scan_baseline = current_psd, baseline_psd
+        else:
+            scan_psd, scan_baseline = current_psd[::stride], baseline_psd[::stride]
         
-        # Find frequencies that exceed threshold
-        threshold = self.config['threshold']
+        # The largest deviation decides whether there is anything to score at all
+        # (nothing above threshold is the usual case) and which anomaly alerts
+        peak_idx, peak_diff = _peak_deviation(scan_psd, scan_baseline)
+        if not abs(peak_diff) > self._threshold_cached:
+            self._quiet_runs += 1
+            return False
+        self._quiet_runs = 0
+        
+        freq_factor = self.get_freq_factor(current_freq, frequencies)
+        hits, distances, signal_increases = _score_bins(
+            scan_psd, scan_baseline, freq_factor[::stride], self._threshold_cached)
+        if stride != 1:
+            hits = hits * stride  # Back to full-resolution bin indices
+            peak_idx *= stride
         anomalies = []
         
-        for i, freq in enumerate(frequencies):
-            if abs(diff[i]) > threshold:
-                # Calculate signal increase percentage
-                signal_increase = self.calculate_signal_increase(current_psd[i], baseline_psd[i])
-                
-                # Estimate distance based on signal strength
-                distance = self.estimate_distance(current_psd[i], baseline_psd[i], freq)
-                
-                anomalies.append({
-                    'frequency': freq,
-                    'baseline_power': baseline_psd[i],
-                    'current_power': current_psd[i],
-                    'difference': diff[i],
-                    'signal_increase': signal_increase,
-                    'distance': distance
-                })
+        for i, distance, signal_increase in zip(hits.tolist(), distances.tolist(), signal_increases.tolist()):
+            anomalies.append({
+                'index': i,  # PSD bin, so plots don't have to search for it
+                'frequency': frequencies[i],
+                'baseline_power': baseline_psd[i],
+                'current_power': current_psd[i],
+                'difference': current_psd[i] - baseline_psd[i],
+                'signal_increase': signal_increase,
+                'distance': None if math.isnan(distance) else round(distance, 1)
+            })
         
         # Plot if anomalies detected
         if anomalies:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = _now_str("%Y%m%d_%H%M%S")
             filename = f"anomaly_{current_freq}MHz_{timestamp}.png"
             
-            self.plot_comparison(frequencies, baseline_psd, current_psd, 
-                               anomalies, filename)
+            image_bytes = self.plot_comparison(frequencies, baseline_psd, current_psd, 
+                                               anomalies, filename)
             
             # Current timestamp
-            now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Log anomalies to enhanced log file
-            for anomaly in anomalies:
-                # Create unique key for this anomaly
-                anomaly_key = f"{current_freq}_{anomaly['frequency']:.3f}"
-                
-                # Check if we've seen this anomaly before
-                if anomaly_key not in self.anomaly_tracker:
-                    self.anomaly_tracker[anomaly_key] = {
-                        'first_seen': now,
-                        'last_seen': now
-                    }
-                else:
-                    # Update last seen time
-                    self.anomaly_tracker[anomaly_key]['last_seen'] = now
-                
-                # Get first seen time
-                first_seen = self.anomaly_tracker[anomaly_key]['first_seen']
-                
-                # Write to enhanced log file
-                try:
-                    with open(self.enhanced_log_file, 'a', newline='') as f:
-                        writer = csv.writer(f)
-                        writer.writerow([
-                            now, 
-                            first_seen,
-                            now,  # last_seen (same as timestamp for new entries)
-                            current_freq,
-                            f"{anomaly['frequency']:.3f}",
-                            f"{anomaly['difference']:.2f}", 
-                            f"{anomaly['signal_increase']:.1f}",
-                            str(anomaly['distance'] if anomaly['distance'] is not None else "N/A"),
-                            "rf_anomaly"
-                        ])
-                except Exception as e:
-                    self.update_dashboard(log_message=f"Error writing to enhanced log: {e}", error=True)
+            now = _now_str()
+            
+            # Plain Python floats of the hit bins format much faster than NumPy scalars
+            hit_diffs = current_psd[hits] - baseline_psd[hits]
+            hit_freqs = frequencies[hits].tolist()
+            diff_values = hit_diffs.tolist()
+            
+            # Update first_seen/last_seen for all anomalies at once
+            first_seen_times = self.track_anomalies(
+                current_freq, hit_freqs, current_psd[hits], now)
+            
+            # Format this scan's rows for the enhanced log file in one pass
+            self.log_anomalies([
+                ANOMALY_LOG_LINE(
+                    now, 
+                    first_seen,
+                    now,  # last_seen (same as timestamp for new entries)
+                    current_freq,
+                    freq,
+                    diff, 
+                    anomaly['signal_increase'],
+                    anomaly['distance'] if anomaly['distance'] is not None else "N/A",
+                    "rf_anomaly"
+                )
+                for anomaly, first_seen, freq, diff in zip(anomalies, first_seen_times, hit_freqs, diff_values)
+            ])
             
-            # Also log to original log file for backward compatibility
-            log_file = os.path.join(self.config['output_dir'], 'anomalies.log')
-            with open(log_file, 'a') as f:
-                for anomaly in anomalies:
-                    f.write(f"{timestamp},{current_freq},{anomaly['frequency']:.3f},{anomaly['difference']:.2f}\n")
+            # Also log to original log file for backward compatibility, as one
+            # chunk per scan built from a template of the fields shared by its rows
+            legacy_line = f"{timestamp},{current_freq},%.3f,%.2f\n"
+            self._legacy_buf.append(''.join([
+                legacy_line % row for row in zip(hit_freqs, diff_values)
+            ]))
+            self.maybe_flush_log_buffers()
             
             # Send alert if configured
             # Include signal increase and distance in the alert
-            max_anomaly = max(anomalies, key=lambda a: abs(a['difference']))
+            max_anomaly = anomalies[int(np.searchsorted(hits, peak_idx))]
             anomaly_alert = {
                 'type': 'spectrum_anomaly', 
                 'frequency': current_freq, 
@@ -1009,7 +1589,7 @@ class RFIntrusionDetector:
                 'distance': max_anomaly['distance']
             }
             
-            self.send_alert(anomalies, current_freq, filename)
+            self.send_alert(anomalies, current_freq, filename, max_anomaly=max_anomaly, image_bytes=image_bytes)
             
             # Update dashboard
             self.update_dashboard(alert=anomaly_alert)
@@ -1018,51 +1598,83 @@ class RFIntrusionDetector:
         
         return False
     
+    def get_plot_figure(self, figsize):
+        """Return a cleared off-screen figure of the given size, reused across plots"""
+        pooled = self._plot_figures.get(figsize)
+        if pooled is None:
+            fig = Figure(figsize=figsize)
+            pooled = (fig, FigureCanvasAgg(fig))
+            self._plot_figures[figsize] = pooled
+        fig = pooled[0]
+        fig.clear()
+        return fig
+    
+    def save_plot(self, fig, filename):
+        """Save a figure as PNG to the output directory, returning the PNG bytes for alerts"""
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=PLOT_DPI)
+        image_bytes = buf.getvalue()
+        with open(self._outdir_sep + filename, 'wb') as f:
+            f.write(image_bytes)
+        return image_bytes
+    
     def plot_spectrum(self, frequencies, psd, title="RF Spectrum", filename=None):
         """Plot RF spectrum"""
-        plt.figure(figsize=(12, 6))
-        plt.plot(frequencies, psd)
-        plt.title(title)
-        plt.xlabel('Frequency (MHz)')
-        plt.ylabel('Power (dB)')
-        plt.grid(True)
-        
-        if filename:
-            plt.savefig(os.path.join(self.config['output_dir'], filename))
-            plt.close()
-        else:
+        if not filename:
+            # Interactive display still needs pyplot
+            plt.figure(figsize=(12, 6))
+            plt.plot(frequencies, psd)
+            plt.title(title)
+            plt.xlabel('Frequency (MHz)')
+            plt.ylabel('Power (dB)')
+            plt.grid(True)
             plt.show()
+            return
+        
+        fig = self.get_plot_figure((12, 6))
+        ax = fig.add_subplot()
+        _set_plot_limits(ax, frequencies, psd.min(), psd.max())
+        ax.plot(frequencies, psd)
+        ax.set_title(title)
+        ax.set_xlabel('Frequency (MHz)')
+        ax.set_ylabel('Power (dB)')
+        ax.grid(True)
+        self.save_plot(fig, filename)
     
     def plot_comparison(self, frequencies, baseline_psd, current_psd, anomalies, filename):
-        """Plot comparison between baseline and current spectrum"""
-        plt.figure(figsize=(12, 8))
+        """Plot comparison between baseline and current spectrum, returning the PNG bytes"""
+        fig = self.get_plot_figure((12, 8))
+        threshold = self.config['threshold']
+        diff = current_psd - baseline_psd
         
         # Plot spectrums
-        plt.subplot(2, 1, 1)
-        plt.plot(frequencies, baseline_psd, label='Baseline', alpha=0.7)
-        plt.plot(frequencies, current_psd, label='Current', alpha=0.7)
+        ax = fig.add_subplot(2, 1, 1)
+        _set_plot_limits(ax, frequencies, min(baseline_psd.min(), current_psd.min()),
+                         max(baseline_psd.max(), current_psd.max()))
+        ax.plot(frequencies, baseline_psd, label='Baseline', alpha=0.7)
+        ax.plot(frequencies, current_psd, label='Current', alpha=0.7)
         
-        # Highlight anomalies
-        for anomaly in anomalies:
-            idx = (np.abs(frequencies - anomaly['frequency'])).argmin()
-            plt.plot(anomaly['frequency'], current_psd[idx], 'ro')
+        # Highlight anomalies, all as markers of a single line
+        hit_idx = [anomaly['index'] for anomaly in anomalies]
+        ax.plot(frequencies[hit_idx], current_psd[hit_idx], 'ro')
         
-        plt.title('RF Spectrum Comparison')
-        plt.ylabel('Power (dB)')
-        plt.legend()
-        plt.grid(True)
+        ax.set_title('RF Spectrum Comparison')
+        ax.set_ylabel('Power (dB)')
+        ax.legend()
+        ax.grid(True)
         
         # Plot difference
-        plt.subplot(2, 1, 2)
-        plt.plot(frequencies, current_psd - baseline_psd)
-        plt.axhline(y=self.config['threshold'], color='r', linestyle='--', alpha=0.7, 
-                   label=f'Threshold (+{self.config["threshold"]} dB)')
-        plt.axhline(y=-self.config['threshold'], color='r', linestyle='--', alpha=0.7, 
-                   label=f'Threshold (-{self.config["threshold"]} dB)')
+        ax = fig.add_subplot(2, 1, 2)
+        _set_plot_limits(ax, frequencies, min(diff.min(), -threshold), max(diff.max(), threshold))
+        ax.plot(frequencies, diff)
+        ax.axhline(y=threshold, color='r', linestyle='--', alpha=0.7, 
+                   label=f'Threshold (+{threshold} dB)')
+        ax.axhline(y=-threshold, color='r', linestyle='--', alpha=0.7, 
+                   label=f'Threshold (-{threshold} dB)')
         
         # Annotate anomalies
         for anomaly in anomalies:
-            idx = (np.abs(frequencies - anomaly['frequency'])).argmin()
+            idx = anomaly['index']
             annotation_text = f"{anomaly['frequency']:.1f} MHz"
             
             # Add signal increase % if available
@@ -1073,28 +1685,30 @@ class RFIntrusionDetector:
             if 'distance' in anomaly and anomaly['distance'] is not None:
                 annotation_text += f"\n~{anomaly['distance']} ft"
                 
-            plt.annotate(annotation_text,
-                        xy=(anomaly['frequency'], current_psd[idx] - baseline_psd[idx]),
+            ax.annotate(annotation_text,
+                        xy=(anomaly['frequency'], diff[idx]),
                         xytext=(0, 20), textcoords='offset points',
                         arrowprops=dict(arrowstyle='->'))
         
-        plt.xlabel('Frequency (MHz)')
-        plt.ylabel('Difference (dB)')
-        plt.legend()
-        plt.grid(True)
+        ax.set_xlabel('Frequency (MHz)')
+        ax.set_ylabel('Difference (dB)')
+        ax.legend()
+        ax.grid(True)
         
         # Save figure
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.config['output_dir'], filename))
-        plt.close()
+        fig.tight_layout()
+        return self.save_plot(fig, filename)
     
     def plot_proximity_breach(self, frequencies, current_psd, breach_info, filename):
-        """Plot proximity breach detection"""
-        plt.figure(figsize=(12, 6))
-        plt.plot(frequencies, current_psd, label='Current', color='red')
+        """Plot proximity breach detection, returning the PNG bytes"""
+        fig = self.get_plot_figure((12, 6))
+        ax = fig.add_subplot()
+        _set_plot_limits(ax, frequencies, min(current_psd.min(), breach_info['reference']),
+                         max(current_psd.max(), breach_info['reference']))
+        ax.plot(frequencies, current_psd, label='Current', color='red')
         
         # Highlight the reference level
-        plt.axhline(y=breach_info['reference'], color='r', linestyle='--', 
+        ax.axhline(y=breach_info['reference'], color='r', linestyle='--', 
                   label=f"Proximity Threshold ({breach_info['distance']} feet)")
         
         # Determine device type based on breach type
@@ -1104,51 +1718,195 @@ class RFIntrusionDetector:
             device_type = "Cell Phone"
         
         # Mark the breach point
-        max_idx = np.argmax(current_psd)
-        plt.plot(frequencies[max_idx], current_psd[max_idx], 'ro', markersize=10)
+        max_idx = breach_info['index']
+        ax.plot(frequencies[max_idx], current_psd[max_idx], 'ro', markersize=10)
         
         # Create annotation with signal increase
         annotation_text = f"{device_type} Detected!"
         if 'signal_increase' in breach_info and breach_info['signal_increase'] is not None:
             annotation_text += f"\nSignal: +{breach_info['signal_increase']:.1f}%"
         
-        plt.annotate(annotation_text, 
+        ax.annotate(annotation_text, 
                    xy=(frequencies[max_idx], current_psd[max_idx]),
                    xytext=(0, 30), textcoords='offset points',
                    arrowprops=dict(arrowstyle='->', color='black'),
                    fontsize=12, fontweight='bold')
         
         # Add title and labels
-        plt.title(f"Proximity Alert: {device_type} within {breach_info['distance']} feet", 
+        ax.set_title(f"Proximity Alert: {device_type} within {breach_info['distance']} feet", 
                 fontsize=14)
-        plt.xlabel('Frequency (MHz)')
-        plt.ylabel('Power (dB)')
-        plt.grid(True)
-        plt.legend()
+        ax.set_xlabel('Frequency (MHz)')
+        ax.set_ylabel('Power (dB)')
+        ax.grid(True)
+        ax.legend()
         
         # Save figure
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.config['output_dir'], filename))
-        plt.close()
+        fig.tight_layout()
+        return self.save_plot(fig, filename)
     
-    def send_alert(self, anomalies, center_freq, image_filename=None):
-        """Send alert with anomaly information"""
-        now = datetime.datetime.now()
+    def _init_alert_settings(self):
+        """Cache the email and SMS settings used by the alert methods"""
+        email_config = self.config.get('email', {})
+        self._email_from = email_config.get('sender')
+        self._email_to = email_config.get('recipient')
+        self._email_server = (email_config.get('server'), email_config.get('port'))
+        self._email_login = (email_config.get('sender'), email_config.get('password'))
+        self._smtp = None  # Logged-in SMTP connection, reused across alerts
         
-        # Check if we should throttle alerts (no more than 1 per 5 minutes)
-        if (now - self.last_alert_time).total_seconds() < 300:
+        sms_config = self.config.get('sms_config', {})
+        self._sms_service = sms_config.get('service')
+        account_sid = sms_config.get('account_sid')
+        auth_token = sms_config.get('auth_token')
+        self._twilio_from = sms_config.get('from_number')
+        self._twilio_to = sms_config.get('to_number')
+        self._twilio_auth = (account_sid, auth_token)
+        if all([account_sid, auth_token, self._twilio_from, self._twilio_to]):
+            self._twilio_url = f'https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json'
+        else:
+            self._twilio_url = None  # Incomplete Twilio configuration
+        
+        # Keep the HTTPS connection to Twilio warm between alerts. Only failed connects are
+        # retried (briefly) - a POST that reached Twilio may already have sent the SMS
+        self._sms_session = None
+        if self.config.get('sms_alerts', False) and self._twilio_url is not None:
+            self._sms_session = requests.Session()
+            self._sms_session.auth = self._twilio_auth
+            retries = requests.adapters.Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5)
+            self._sms_session.mount('https://', requests.adapters.HTTPAdapter(
+                pool_connections=2, pool_maxsize=2, max_retries=retries))
+        
+        # Emails and SMS are sent from a background thread, see deliver_alert; it only
+        # reports back through _alert_results, so curses stays on the main thread
+        self._alert_queue = queue.Queue(maxsize=ALERT_QUEUE_SIZE)
+        self._alert_results = deque()  # (log message, error) per finished delivery
+        self._alert_thread = None  # Started with the first delivery
+    
+    def deliver_alert(self, send, *args):
+        """Queue an alert send for the alert thread, so a slow mail or SMS server can't stall scanning"""
+        if self._alert_thread is None:
+            self._alert_thread = threading.Thread(target=self._alert_worker, name='rf-ids-alerts', daemon=True)
+            self._alert_thread.start()
+        try:
+            self._alert_queue.put_nowait((send, args))
+        except queue.Full:
+            # Make room by dropping the oldest pending delivery
+            try:
+                self._alert_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._alert_queue.put_nowait((send, args))
+            self.update_dashboard(log_message="Alert queue full - dropped the oldest pending alert", error=True)
+    
+    def _alert_worker(self):
+        """Alert thread: run queued sends until the None sentinel from close()"""
+        while True:
+            job = self._alert_queue.get()
+            if job is None:
+                # Only this thread uses the connections once it has started
+                self.close_alert_connections()
+                return
+            send, args = job
+            try:
+                self._alert_results.append(send(*args))
+            except Exception as e:
+                self._alert_results.append((f"Failed to send alert: {e}", True))
+    
+    def report_alert_results(self):
+        """Log the outcomes of finished alert deliveries to the dashboard"""
+        results = self._alert_results
+        while results:
+            log_message, error = results.popleft()
+            self.update_dashboard(log_message=log_message, error=error)
+    
+    def _deliver_email(self, msg):
+        """Alert thread: send an alert email, returning the dashboard log line for the outcome"""
+        try:
+            self.send_email(msg)
+            return "Alert email sent successfully", False
+        except Exception as e:
+            return f"Failed to send email alert: {e}", True
+    
+    def _deliver_sms(self, data):
+        """Alert thread: post an SMS to Twilio, returning the dashboard log line for the outcome"""
+        try:
+            response = self._sms_session.post(self._twilio_url, data=data, timeout=5)
+            if response.status_code == 201:
+                return "SMS alert sent successfully", False
+            return f"SMS alert failed: {response.json().get('message', 'Unknown error')}", True
+        except Exception as e:
+            return f"Failed to send SMS alert: {e}", True
+    
+    def send_email(self, msg):
+        """Send an email over the persistent SMTP connection, reconnecting once if it dropped"""
+        for attempt in range(2):
+            try:
+                if self._smtp is None:
+                    server = smtplib.SMTP(*self._email_server, timeout=SMTP_TIMEOUT)
+                    server.starttls()
+                    server.login(*self._email_login)
+                    self._smtp = server
+                self._smtp.send_message(msg)
+                return
+            except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, OSError):
+                # Stale or broken connection - drop it and retry with a fresh one
+                self.close_smtp()
+                if attempt:
+                    raise
+    
+    def close_smtp(self):
+        """Close the persistent SMTP connection if one is open"""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+    
+    def close_alert_connections(self):
+        """Close the SMTP connection and SMS session used to deliver alerts"""
+        self.close_smtp()
+        if self._sms_session is not None:
+            self._sms_session.close()
+    
+    def throttle_alert(self, kind, interval):
+        """Take a token for an alert of this kind: None if the alert is throttled, otherwise
+        the number of alerts of the kind suppressed since the last one that went out"""
+        now = time.monotonic()
+        bucket = self._alert_buckets.get(kind)
+        if bucket is None:
+            bucket = self._alert_buckets[kind] = _AlertBucket(now)
+        
+        # Refill at one token per interval, holding at most a burst's worth
+        bucket.tokens = min(ALERT_BURST, bucket.tokens + (now - bucket.updated) / interval)
+        bucket.updated = now
+        if bucket.tokens < 1:
+            bucket.suppressed += 1
+            return None
+        
+        bucket.tokens -= 1
+        suppressed, bucket.suppressed = bucket.suppressed, 0
+        return suppressed
+    
+    def send_alert(self, anomalies, center_freq, image_filename=None, max_anomaly=None, image_bytes=None):
+        """Send alert with anomaly information"""
+        # Throttle alerts (short bursts, then no more than 1 per 5 minutes); the next
+        # alert that goes out reports how many were held back
+        suppressed = self.throttle_alert('spectrum_anomaly', ANOMALY_ALERT_INTERVAL)
+        if suppressed is None:
             return
+        repeat_note = f" ({suppressed} similar alerts suppressed)" if suppressed else ""
         
-        self.last_alert_time = now
+        now = datetime.datetime.now()
         self.alert_count += 1
         
-        # Get the strongest anomaly for reporting
-        max_anomaly = max(anomalies, key=lambda a: abs(a['difference']))
+        # Get the strongest anomaly for reporting (the scan passes it in)
+        if max_anomaly is None:
+            max_anomaly = max(anomalies, key=lambda a: abs(a['difference']))
         signal_increase = max_anomaly.get('signal_increase', 0)
         distance = max_anomaly.get('distance', 'unknown')
         
         # Update log with enhanced info
-        self.update_dashboard(log_message=f"ALERT: {len(anomalies)} anomalies detected at {center_freq} MHz (Signal: +{signal_increase:.1f}%, Dist: {distance} ft)")
+        self.update_dashboard(log_message=f"ALERT: {len(anomalies)} anomalies detected at {center_freq} MHz (Signal: +{signal_increase:.1f}%, Dist: {distance} ft){repeat_note}")
         
         # macOS notification
         if NOTIFICATIONS_AVAILABLE:
@@ -1160,15 +1918,15 @@ class RFIntrusionDetector:
             pync.notify(f"Detected {len(anomalies)} anomalies at {center_freq} MHz band\nSignal: +{signal_increase:.1f}%", 
                      title=f"RF-IDS Alert #{self.alert_count}", 
                      sound="Basso",
-                     open=os.path.join(self.config['output_dir'], image_filename))
+                     open=self._outdir_sep + image_filename)
         
         # Send email if configured
         if self.config['email_alerts']:
             try:
                 msg = EmailMessage()
                 msg['Subject'] = f'RF-IDS Alert: {len(anomalies)} anomalies at {center_freq} MHz'
-                msg['From'] = self.config['email']['sender']
-                msg['To'] = self.config['email']['recipient']
+                msg['From'] = self._email_from
+                msg['To'] = self._email_to
                 
                 # Create email content with enhanced info
                 content = f"""
@@ -1180,34 +1938,32 @@ class RFIntrusionDetector:
                 
                 """
                 
-                for i, anomaly in enumerate(anomalies):
-                    content += f"{i+1}. Frequency: {anomaly['frequency']:.3f} MHz, " + \
-                              f"Difference: {anomaly['difference']:.2f} dB, " + \
-                              f"Signal Increase: +{anomaly['signal_increase']:.1f}%"
-                    
-                    if anomaly['distance'] is not None:
-                        content += f", Est. Distance: ~{anomaly['distance']} feet"
-                    
-                    content += "\n"
+                # One line per anomaly, joined once rather than grown with +=
+                content += ''.join([
+                    f"{i}. Frequency: {anomaly['frequency']:.3f} MHz, "
+                    f"Difference: {anomaly['difference']:.2f} dB, "
+                    f"Signal Increase: +{anomaly['signal_increase']:.1f}%"
+                    + ("" if anomaly['distance'] is None else f", Est. Distance: ~{anomaly['distance']} feet")
+                    + "\n"
+                    for i, anomaly in enumerate(anomalies, 1)
+                ])
+                
+                if suppressed:
+                    content += f"\n{suppressed} similar alerts were suppressed since the last one.\n"
                 
                 msg.set_content(content)
                 
-                # Add image attachment if available
+                # Add image attachment if available (the plot passes its PNG bytes
+                # along, so the file it just wrote doesn't have to be read back)
                 if image_filename:
-                    image_path = os.path.join(self.config['output_dir'], image_filename)
-                    with open(image_path, 'rb') as img:
-                        img_data = img.read()
-                        msg.add_attachment(img_data, maintype='image', 
-                                         subtype='png', filename=image_filename)
-                
-                # Send email
-                server = smtplib.SMTP(self.config['email']['server'], self.config['email']['port'])
-                server.starttls()
-                server.login(self.config['email']['sender'], self.config['email']['password'])
-                server.send_message(msg)
-                server.quit()
+                    if image_bytes is None:
+                        with open(self._outdir_sep + image_filename, 'rb') as img:
+                            image_bytes = img.read()
+                    msg.add_attachment(image_bytes, maintype='image', 
+                                     subtype='png', filename=image_filename)
                 
-                self.update_dashboard(log_message="Alert email sent successfully")
+                # Send email from the alert thread
+                self.deliver_alert(self._deliver_email, msg)
             
             except Exception as e:
                 self.update_dashboard(log_message=f"Failed to send email alert: {e}", error=True)
@@ -1215,20 +1971,20 @@ class RFIntrusionDetector:
         # Send SMS if configured
         if self.config.get('sms_alerts', False):
             try:
-                message = f"RF-IDS Alert #{self.alert_count}: {len(anomalies)} anomalies at {center_freq} MHz band. Signal: +{signal_increase:.1f}%, Dist: {distance} ft"
+                message = f"RF-IDS Alert #{self.alert_count}: {len(anomalies)} anomalies at {center_freq} MHz band. Signal: +{signal_increase:.1f}%, Dist: {distance} ft{repeat_note}"
                 self.send_sms_alert(message)
             except Exception as e:
                 self.update_dashboard(log_message=f"Failed to send SMS alert: {e}", error=True)
     
-    def send_proximity_alert(self, breach_info, image_filename=None):
+    def send_proximity_alert(self, breach_info, image_filename=None, image_bytes=None):
         """Send alert specifically for proximity breaches"""
-        now = datetime.datetime.now()
-        
-        # Check if we should throttle alerts (no more than 1 per minute for proximity)
-        if (now - self.last_alert_time).total_seconds() < 60:
+        # Throttle alerts per device type (short bursts, then no more than 1 per minute)
+        suppressed = self.throttle_alert(f"proximity_{breach_info['type']}", PROXIMITY_ALERT_INTERVAL)
+        if suppressed is None:
             return
+        repeat_note = f" ({suppressed} similar alerts suppressed)" if suppressed else ""
         
-        self.last_alert_time = now
+        now = datetime.datetime.now()
         self.alert_count += 1
         
         # Determine device type for readable message
@@ -1238,22 +1994,22 @@ class RFIntrusionDetector:
         signal_increase = breach_info.get('signal_increase', 0)
         
         # Update log with enhanced info
-        self.update_dashboard(log_message=f"PROXIMITY ALERT: {device_type} within {breach_info['distance']} feet (Signal: +{signal_increase:.1f}%)")
+        self.update_dashboard(log_message=f"PROXIMITY ALERT: {device_type} within {breach_info['distance']} feet (Signal: +{signal_increase:.1f}%){repeat_note}")
         
         # macOS notification with higher urgency
         if NOTIFICATIONS_AVAILABLE:
             pync.notify(f"A {device_type} is within {breach_info['distance']} feet!\nSignal: +{signal_increase:.1f}%", 
                      title=f"PROXIMITY ALERT!", 
                      sound="Basso",
-                     open=os.path.join(self.config['output_dir'], image_filename))
+                     open=self._outdir_sep + image_filename)
         
         # Send email if configured
         if self.config['email_alerts']:
             try:
                 msg = EmailMessage()
                 msg['Subject'] = f'RF-IDS PROXIMITY ALERT: {device_type} detected'
-                msg['From'] = self.config['email']['sender']
-                msg['To'] = self.config['email']['recipient']
+                msg['From'] = self._email_from
+                msg['To'] = self._email_to
                 
                 # Create email content with enhanced info
                 content = f"""
@@ -1270,24 +2026,22 @@ class RFIntrusionDetector:
                 This could indicate unauthorized device presence in your secure area.
                 """
                 
+                if suppressed:
+                    content += f"\n{suppressed} similar alerts were suppressed since the last one.\n"
+                
                 msg.set_content(content)
                 
-                # Add image attachment if available
+                # Add image attachment if available (the plot passes its PNG bytes
+                # along, so the file it just wrote doesn't have to be read back)
                 if image_filename:
-                    image_path = os.path.join(self.config['output_dir'], image_filename)
-                    with open(image_path, 'rb') as img:
-                        img_data = img.read()
-                        msg.add_attachment(img_data, maintype='image', 
-                                         subtype='png', filename=image_filename)
+                    if image_bytes is None:
+                        with open(self._outdir_sep + image_filename, 'rb') as img:
+                            image_bytes = img.read()
+                    msg.add_attachment(image_bytes, maintype='image', 
+                                     subtype='png', filename=image_filename)
                 
-                # Send email
-                server = smtplib.SMTP(self.config['email']['server'], self.config['email']['port'])
-                server.starttls()
-                server.login(self.config['email']['sender'], self.config['email']['password'])
-                server.send_message(msg)
-                server.quit()
-                
-                self.update_dashboard(log_message="Alert email sent successfully")
+                # Send email from the alert thread
+                self.deliver_alert(self._deliver_email, msg)
             
             except Exception as e:
                 self.update_dashboard(log_message=f"Failed to send email alert: {e}", error=True)
@@ -1295,7 +2049,7 @@ class RFIntrusionDetector:
         # Send SMS if configured
         if self.config.get('sms_alerts', False):
             try:
-                message = f"RF-IDS PROXIMITY ALERT: {device_type} detected within {breach_info['distance']} feet! Signal: +{signal_increase:.1f}%"
+                message = f"RF-IDS PROXIMITY ALERT: {device_type} detected within {breach_info['distance']} feet! Signal: +{signal_increase:.1f}%{repeat_note}"
                 self.send_sms_alert(message)
             except Exception as e:
                 self.update_dashboard(log_message=f"Failed to send SMS alert: {e}", error=True)
@@ -1305,169 +2059,173 @@ class RFIntrusionDetector:
         if not self.config.get('sms_alerts', False):
             return
             
-        sms_config = self.config.get('sms_config', {})
-        if sms_config.get('service') == 'twilio':
+        if self._sms_service == 'twilio':
             try:
-                account_sid = sms_config.get('account_sid')
-                auth_token = sms_config.get('auth_token')
-                from_number = sms_config.get('from_number')
-                to_number = sms_config.get('to_number')
-                
                 # Check if all required fields are present
-                if not all([account_sid, auth_token, from_number, to_number]):
+                if self._twilio_url is None:
                     self.update_dashboard(log_message="SMS alert failed: Missing Twilio configuration", error=True)
                     return
                     
-                # Send SMS using Twilio API
-                url = f'https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json'
+                # Send SMS using Twilio API, from the alert thread
                 data = {
-                    'From': from_number,
-                    'To': to_number,
+                    'From': self._twilio_from,
+                    'To': self._twilio_to,
                     'Body': message
                 }
-                
-                response = requests.post(
-                    url,
-                    data=data,
-                    auth=(account_sid, auth_token)
-                )
-                
-                if response.status_code == 201:
-                    self.update_dashboard(log_message="SMS alert sent successfully")
-                else:
-                    self.update_dashboard(log_message=f"SMS alert failed: {response.json().get('message', 'Unknown error')}", error=True)
+                self.deliver_alert(self._deliver_sms, data)
                     
             except Exception as e:
                 self.update_dashboard(log_message=f"Failed to send SMS alert: {e}", error=True)
     
-    def monitor_frequency(self, frequency):
-        """Monitor a specific frequency with error recovery"""
-        global DASHBOARD
-        
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                self.update_dashboard(status=f"Monitoring frequency: {frequency} MHz", current_freq=frequency)
-                self.sdr.center_freq = frequency * 1e6
-                
-                # Increment scan count
-                DASHBOARD['scan_count'] = DASHBOARD.get('scan_count', 0) + 1
-                
-                # Capture spectrum for signal level indicator
-                try:
-                    samples = self.sdr.read_samples(4096)  # Larger sample for better signal detection
-                    # Calculate signal power - use log scale for better visibility
-                    power = np.mean(np.abs(samples)**2)
-                    # Add noise floor and use log scale to make weak signals visible
-                    # Ensure meter always shows some activity with minimum 0.1 level
-                    log_power = np.log10(power + 1e-10)  # Avoid log(0)
-                    # Normalize to 0.1-1.0 range (never empty) with some scaling
-                    min_level = 0.1  # Minimum level to always show some activity
-                    normalized_power = min_level + (1.0 - min_level) * min(1.0, max(0, (log_power + 10) / 10))
-                    DASHBOARD['signal_level'] = normalized_power
-                    
-                    # Store current signal strength in dB for display
-                    if len(samples) > 0:
-                        signal_db = 10 * np.log10(power + 1e-10)
-                        DASHBOARD['signal_db'] = signal_db
-                    
-                    # Force dashboard refresh to show activity
-                    if self.stdscr and not DASHBOARD.get('viewing_logs', False):
-                        self.draw_dashboard()
-                except Exception:
-                    # If error, ensure we show some movement in the meter
-                    import random
-                    DASHBOARD['signal_level'] = 0.1 + random.random() * 0.3
-                    pass
-                
-                return self.scan_for_intrusions(frequency)
-            except Exception as e:
-                self.update_dashboard(log_message=f"Error with frequency {frequency} MHz (attempt {attempt+1}/{max_retries}): {e}", error=True)
-                if attempt < max_retries - 1:
-                    self.update_dashboard(log_message=f"Retrying in 2 seconds...")
-                    time.sleep(2)
-                    # Try to reset the device
+    def monitor_frequency(self, frequency, frequency_hz=None):
+        """Monitor a specific frequency (MHz, optionally also given in Hz) with error recovery"""
+        try:
+            detected = self._monitor_fast(frequency, frequency * 1e6 if frequency_hz is None else frequency_hz)
+        except Exception as error:
+            self._monitor_failed(frequency, error)
+            return False
+        if self._monitor_failures:
+            self._monitor_failures.pop(frequency, None)
+        return detected
+    
+    def _monitor_fast(self, frequency, frequency_hz):
+        """One monitoring pass over a frequency: tune, update the signal meter, scan"""
+        dashboard = DASHBOARD
+        sdr = self.sdr
+        self.update_dashboard(status=f"Monitoring frequency: {frequency} MHz", current_freq=frequency)
+        # Only retune when the frequency actually changes
+        if abs(sdr.center_freq - frequency_hz) >= 1:
+            sdr.center_freq = frequency_hz
+        
+        # Increment scan count
+        dashboard['scan_count'] += 1
+        
+        # Capture spectrum for signal level indicator
+        try:
+            # Raw 8-bit I/Q, scaled to +/-1.0 like read_samples does but into the
+            # reused meter buffer instead of fresh float64/complex arrays
+            raw = np.frombuffer(sdr.read_bytes(2 * METER_SAMPLES), dtype=np.uint8)
+            iq = self._meter_iq[:raw.size]
+            _u8_to_iq(raw, iq)
+            # Meter level and signal strength in dB from one pass over the I/Q floats
+            dashboard['signal_level'], dashboard['signal_db'] = _signal_level(iq)
+            
+            # Force dashboard refresh to show activity
+            if self.stdscr and not dashboard['viewing_logs']:
+                self.draw_dashboard()
+        except Exception:
+            # If error, ensure we show some movement in the meter
+            dashboard['signal_level'] = next(self._meter_idle_levels)
+        
+        return self.scan_for_intrusions(frequency)
+    
+    def _monitor_failed(self, frequency, error):
+        """Recover from a failed monitoring pass over a frequency"""
+        # Rather than sleeping and retrying here, which would hold up every other
+        # frequency, put this one on a short cooldown and let the sweep move on
+        failures = self._monitor_failures.get(frequency, 0) + 1
+        self._monitor_failures[frequency] = failures
+        self.update_dashboard(log_message=f"Error with frequency {frequency} MHz (attempt {failures}/{MONITOR_MAX_FAILURES}): {error}", error=True)
+        if failures < MONITOR_MAX_FAILURES:
+            self.update_dashboard(log_message=f"Retrying in {MONITOR_RETRY_COOLDOWN:g} seconds...")
+            self._cooldown_until[frequency] = time.monotonic() + MONITOR_RETRY_COOLDOWN
+            # Reset the device, unless it still works and the error came from elsewhere
+            if not self.sdr_healthy():
+                if self.sdr_probe_pending():
+                    self.update_dashboard(log_message="RTL-SDR not responding - reset deferred until its pending read returns", error=True)
+                else:
                     try:
                         self.sdr.close()
-                        self.sdr = RtlSdr()
-                        self.sdr.sample_rate = self.config['sample_rate']
-                        self.sdr.gain = self.config['gain']
+                        self._init_sdr()
                     except Exception as reset_error:
                         self.update_dashboard(log_message=f"Error resetting device: {reset_error}", error=True)
-                else:
-                    self.update_dashboard(log_message=f"Failed to monitor {frequency} MHz after {max_retries} attempts.", error=True)
-                    self.update_dashboard(log_message=f"Removing {frequency} MHz from monitoring list.", error=True)
-                    if frequency in self.config['frequencies']:
-                        self.config['frequencies'].remove(frequency)
-                        # Save updated config
-                        with open('config.json', 'w') as f:
-                            json.dump(self.config, f, indent=4)
-                    
-                    # Try switching to a known safe frequency
-                    try:
-                        self.sdr.center_freq = 100e6  # FM radio is usually safe
-                        self.update_dashboard(log_message="Reset to safe frequency")
-                    except:
-                        pass
+        else:
+            self.update_dashboard(log_message=f"Failed to monitor {frequency} MHz after {MONITOR_MAX_FAILURES} attempts.", error=True)
+            self.update_dashboard(log_message=f"Removing {frequency} MHz from monitoring list.", error=True)
+            # Dropped from the config once the current sweep is done, see run
+            self._pending_removals.add(frequency)
+            self._monitor_failures.pop(frequency, None)
+            self._cooldown_until.pop(frequency, None)
+            # A frequency under the cached maximum that keeps failing suggests the cache
+            # is wrong for this device - test the range again on the next start
+            self.config['device_id'] = None
+            
+            # Try switching to a known safe frequency
+            try:
+                self.sdr.center_freq = 100e6  # FM radio is usually safe
+                self.update_dashboard(log_message="Reset to safe frequency")
+            except:
+                pass
+    
+    def handle_log_viewer_key(self, key):
+        """Handle a key press in the log viewer, returns True if the viewer needs redrawing"""
+        if key == ord('q'):  # Return to dashboard
+            DASHBOARD['viewing_logs'] = False
+        elif key == ord('n'):  # Next page
+            if DASHBOARD['log_page'] < DASHBOARD['total_pages'] - 1:
+                DASHBOARD['log_page'] += 1
+            return True
+        elif key == ord('p'):  # Previous page
+            if DASHBOARD['log_page'] > 0:
+                DASHBOARD['log_page'] -= 1
+            return True
+        elif key == ord('t'):  # Switch log type
+            DASHBOARD['log_type'] = (DASHBOARD.get('log_type', 0) + 1) % 2
+            self.load_log_entries()
+            return True
+        elif key == curses.KEY_RESIZE:  # Lay the viewer out for the new size
+            return True
         return False
     
-    def handle_log_viewer_input(self):
-        """Handle user input for log viewer"""
-        try:
-            # Check for keypress (non-blocking)
-            self.stdscr.nodelay(True)
-            key = self.stdscr.getch()
-            
-            if key == ord('q'):  # Return to dashboard
-                DASHBOARD['viewing_logs'] = False
-                return True
-            elif key == ord('n'):  # Next page
-                total_pages = max(1, (len(DASHBOARD['log_entries']) + LOG_ENTRIES_PER_PAGE - 1) // LOG_ENTRIES_PER_PAGE)
-                if DASHBOARD['log_page'] < total_pages - 1:
-                    DASHBOARD['log_page'] += 1
-                self.draw_log_viewer()
-            elif key == ord('p'):  # Previous page
-                if DASHBOARD['log_page'] > 0:
-                    DASHBOARD['log_page'] -= 1
-                self.draw_log_viewer()
-            elif key == ord('t'):  # Switch log type
-                DASHBOARD['log_type'] = (DASHBOARD.get('log_type', 0) + 1) % 2
-                self.load_log_entries()
-                self.draw_log_viewer()
-        except:
-            pass
-            
+    def handle_dashboard_key(self, key):
+        """Handle a key press on the dashboard, returns False if the user asked to quit"""
+        if key == ord('q'):  # Quit
+            return False
+        elif key == ord('r'):  # Reset baseline
+            self.update_dashboard(status="Resetting baseline...")
+            self.baseline = None
+            try:
+                os.remove(self.baseline_file)
+            except FileNotFoundError:
+                pass
+            self.create_baseline()
+            self.update_dashboard(status="Baseline reset complete")
+        elif key == ord('l'):  # View logs
+            DASHBOARD['viewing_logs'] = True
+            DASHBOARD['log_type'] = 0  # Default to anomaly log
+            self.load_log_entries()
         return True
     
     def handle_user_input(self):
         """Handle user input for keyboard commands"""
         if not self.stdscr:
             return True
-            
-        # If viewing logs, handle log viewer input
-        if DASHBOARD.get('viewing_logs', False):
-            return self.handle_log_viewer_input()
-            
+        
+        redraw_viewer = False
         try:
-            # Check for keypress (non-blocking)
-            self.stdscr.nodelay(True)
+            # getch() waits up to INPUT_POLL_TIMEOUT_MS for a key press...
             key = self.stdscr.getch()
-            
-            if key == ord('q'):  # Quit
-                return False
-            elif key == ord('r'):  # Reset baseline
-                self.update_dashboard(status="Resetting baseline...")
-                self.baseline = None
-                os.remove(self.baseline_file) if os.path.exists(self.baseline_file) else None
-                self.create_baseline()
-                self.update_dashboard(status="Baseline reset complete")
-            elif key == ord('l'):  # View logs
-                DASHBOARD['viewing_logs'] = True
-                DASHBOARD['log_type'] = 0  # Default to anomaly log
-                self.load_log_entries()
-                self.draw_log_viewer()
-        except:
-            pass
+            if key != curses.ERR:
+                # ...then everything already queued is handled without waiting,
+                # so the screen is only redrawn once all pending input is processed
+                self.stdscr.nodelay(True)
+                try:
+                    while key != curses.ERR:
+                        if DASHBOARD['viewing_logs']:
+                            redraw_viewer |= self.handle_log_viewer_key(key)
+                        elif not self.handle_dashboard_key(key):
+                            return False
+                        else:
+                            redraw_viewer |= DASHBOARD['viewing_logs']
+                        key = self.stdscr.getch()
+                finally:
+                    # Keys are the only thing that opens or closes the viewer
+                    self.stdscr.timeout(LOG_VIEWER_POLL_TIMEOUT_MS if DASHBOARD['viewing_logs'] else INPUT_POLL_TIMEOUT_MS)
+        except Exception:
+            pass  # Ctrl-C still goes up to run()
+        
+        if redraw_viewer and DASHBOARD['viewing_logs']:
+            self.draw_log_viewer()
             
         return True
     
@@ -1478,27 +2236,14 @@ class RFIntrusionDetector:
             if self.config.get('proximity_detection', {}).get('enabled', False) and \
                self.config.get('proximity_detection', {}).get('calibration_needed', True):
                 self.calibrate_proximity_detection()
+                self.init_proximity_refs()
             
             # Make sure output directory exists
             os.makedirs(self.config['output_dir'], exist_ok=True)
             
             # Create enhanced log files if they don't exist
-            if not os.path.exists(self.enhanced_log_file):
-                with open(self.enhanced_log_file, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        'timestamp', 'first_seen', 'last_seen', 'center_freq', 
-                        'anomaly_freq', 'difference_db', 'signal_increase_pct',
-                        'estimated_distance', 'type'
-                    ])
-            
-            if not os.path.exists(self.proximity_log_file):
-                with open(self.proximity_log_file, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        'timestamp', 'first_seen', 'last_seen', 'device_type', 
-                        'frequency', 'power_db', 'distance', 'status'
-                    ])
+            self.create_log_file(self.enhanced_log_file, ANOMALY_LOG_HEADER)
+            self.create_log_file(self.proximity_log_file, PROXIMITY_LOG_HEADER)
             
             # Load or create baseline
             if self.baseline is None:
@@ -1525,9 +2270,9 @@ class RFIntrusionDetector:
             if not self.config['frequencies']:
                 self.update_dashboard(log_message="No valid frequencies to monitor! Adding some safe defaults.", error=True)
                 # Add some safe defaults
-                self.config['frequencies'] = [100, 200, 433]  # FM radio, VHF, ISM band
-                with open('config.json', 'w') as f:
-                    json.dump(self.config, f, indent=4)
+                self.set_frequencies([100, 200, 433])  # FM radio, VHF, ISM band
+                self._config_dirty = True
+                self.save_config()
             
             self.update_dashboard(log_message=f"Monitoring {len(self.config['frequencies'])} frequencies: {', '.join(map(str, self.config['frequencies']))} MHz")
             self.update_dashboard(log_message=f"Scan interval: {self.config['scan_interval']} seconds")
@@ -1574,19 +2319,19 @@ class RFIntrusionDetector:
                 "Checking signal patterns...",
                 "Monitoring RF environment..."
             ]
-            last_ticker_update = 0
+            last_ticker_update = float('-inf')  # Show the first message right away
             ticker_index = 0
             
             while True:
                 # Update status ticker every 3 seconds
-                current_time = time.time()
-                if current_time - last_ticker_update > 3 and not DASHBOARD.get('viewing_logs', False):
+                current_time = time.monotonic()
+                if current_time - last_ticker_update > 3 and not DASHBOARD['viewing_logs']:
                     self.update_dashboard(status=ticker_messages[ticker_index])
                     ticker_index = (ticker_index + 1) % len(ticker_messages)
                     last_ticker_update = current_time
                     
                     # Force dashboard refresh to show "alive" status
-                    if self.stdscr and not DASHBOARD.get('viewing_logs', False):
+                    if self.stdscr:
                         self.draw_dashboard()
                 
                 # Check for user input
@@ -1594,10 +2339,12 @@ class RFIntrusionDetector:
                     self.update_dashboard(status="User requested exit...")
                     break
                 
-                # If viewing logs, just continue and poll for input
-                if DASHBOARD.get('viewing_logs', False):
-                    time.sleep(0.1)
-                    self.draw_log_viewer()
+                # If viewing logs, just continue and poll for input - getch() does the
+                # waiting, and keys redraw the viewer, so it is only repainted here
+                # when its clock moves on to the next second
+                if DASHBOARD['viewing_logs']:
+                    if int(time.time()) != self._viewer_drawn_at:
+                        self.draw_log_viewer()
                     continue
                 
                 # Check if we still have frequencies to monitor
@@ -1607,37 +2354,68 @@ class RFIntrusionDetector:
                 
                 # Try to monitor each frequency
                 monitoring_successful = False
-                for freq in list(self.config['frequencies']):  # Use list() to allow removing items during iteration
+                attempted = False  # Stays False if every frequency is cooling down
+                # set_frequencies swaps in new lists instead of editing them in place,
+                # so this iterates a stable snapshot of the sweep
+                cooldown_until = self._cooldown_until
+                scan_interval = self.config['scan_interval']
+                monitor = self.monitor_frequency
+                for freq, freq_hz in zip(self.config['frequencies'], self._freqs_hz):
+                    # Skip frequencies that recently failed until their cooldown is over
+                    if cooldown_until and time.monotonic() < cooldown_until.get(freq, 0):
+                        continue
+                    attempted = True
                     try:
-                        detected = self.monitor_frequency(freq)
+                        detected = monitor(freq, freq_hz)
                         monitoring_successful = True  # At least one frequency monitored successfully
                         
                         if detected:
                             # Increase scan rate temporarily if anomaly detected
                             time.sleep(1)
                         else:
-                            time.sleep(self.config['scan_interval'])
+                            time.sleep(scan_interval)
                     except Exception as e:
                         self.update_dashboard(log_message=f"Unexpected error monitoring {freq} MHz: {e}", error=True)
-                        # Try to reset the SDR if we're having problems
-                        try:
-                            self.sdr.close()
-                            time.sleep(1)
-                            self.sdr = RtlSdr()
-                            self.sdr.sample_rate = self.config['sample_rate']
-                            self.sdr.gain = self.config['gain']
-                            self.update_dashboard(log_message="Reset RTL-SDR device")
-                        except Exception as reset_error:
-                            self.update_dashboard(log_message=f"Error resetting device: {reset_error}", error=True)
+                        # Try to reset the SDR if it is the one having problems
+                        if not self.sdr_healthy():
+                            if self.sdr_probe_pending():
+                                self.update_dashboard(log_message="RTL-SDR not responding - reset deferred until its pending read returns", error=True)
+                            else:
+                                try:
+                                    self.sdr.close()
+                                    time.sleep(1)
+                                    self._init_sdr()
+                                    self.update_dashboard(log_message="Reset RTL-SDR device")
+                                except Exception as reset_error:
+                                    self.update_dashboard(log_message=f"Error resetting device: {reset_error}", error=True)
+                
+                # Drop the frequencies that failed for good during this sweep; changes
+                # are written at most every CONFIG_SAVE_INTERVAL, not per failure
+                if self._pending_removals:
+                    pending = self._pending_removals
+                    self.set_frequencies([f for f in self.config['frequencies'] if f not in pending])
+                    pending.clear()
+                    self._config_dirty = True
+                self.maybe_save_config()
+                
+                # Write out any log rows that have been waiting too long
+                self.maybe_flush_log_buffers()
+                
+                # Show how the alerts sent in the background went
+                self.report_alert_results()
                 
                 # Reset error count if we had a successful monitoring cycle
                 if monitoring_successful:
                     error_count = 0
-                else:
+                elif attempted:
                     error_count += 1
                     self.update_dashboard(log_message=f"Full monitoring cycle failed (consecutive failures: {error_count}/{max_consecutive_errors})", error=True)
                     # Wait longer after errors to give the device time to recover
                     time.sleep(5)
+                elif cooldown_until:
+                    # Every frequency is cooling down - wait for the first one to be due
+                    wait = min(cooldown_until.values()) - time.monotonic()
+                    time.sleep(min(scan_interval, max(COOLDOWN_MIN_WAIT, wait)))
                 
                 # Exit if we've had too many errors in a row
                 if error_count >= max_consecutive_errors:
@@ -1656,24 +2434,53 @@ class RFIntrusionDetector:
             traceback.print_exc()
         
         finally:
-            try:
-                self.sdr.close()
-                self.update_dashboard(log_message="SDR device closed")
-            except:
-                self.update_dashboard(log_message="Note: Error while closing SDR device")
+            if self.sdr_probe_pending(SDR_CLOSE_WAIT):
+                self.update_dashboard(log_message="Note: SDR device still busy, left open", error=True)
+            else:
+                try:
+                    self.sdr.close()
+                    self.update_dashboard(log_message="SDR device closed")
+                except:
+                    self.update_dashboard(log_message="Note: Error while closing SDR device")
+    
+    def close_logs(self):
+        """Write out the pending log rows and close the log files"""
+        self.flush_log_buffers()
+        for fh in (self._anom_fh, self._prox_fh, self._legacy_fh, self._alert_fh):
+            fh.close()
     
     def close(self):
         """Clean up resources"""
+        atexit.unregister(self.close_logs)
+        self.close_logs()
         try:
-            self.sdr.close()
-        except:
-            pass
+            self.save_config()
+        except OSError as e:
+            print(f"Error saving configuration: {e}")
+        # Let queued alerts go out - the alert thread closes its connections when it
+        # reaches the sentinel, and one still stuck sending is left to exit with the process
+        if self._alert_thread is not None:
+            try:
+                self._alert_queue.put(None, timeout=SMTP_TIMEOUT)
+            except queue.Full:
+                pass
+            self._alert_thread.join(timeout=SMTP_TIMEOUT)
+            self.report_alert_results()
+        else:
+            self.close_alert_connections()
+        # A device with a health probe stuck in a read is left for process exit to release
+        if not self.sdr_probe_pending(SDR_CLOSE_WAIT):
+            try:
+                self.sdr.close()
+            except:
+                pass
 
 def run_with_dashboard(stdscr):
     """Run the RF-IDS system with a curses dashboard"""
     # Set up curses
     curses.curs_set(0)  # Hide cursor
     stdscr.nodelay(True)  # Non-blocking input
+    stdscr.timeout(INPUT_POLL_TIMEOUT_MS)  # ...but let getch() idle briefly instead of spinning
     
     # Try to initialize colors if terminal supports them
     if curses.has_colors():
@@ -0,0 +1,84 @@
+import importlib.util
+import os
+import shutil
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+
+class FakeRtlSdr:
+    """Stand-in for rtlsdr.RtlSdr, so the tests run without a device or librtlsdr"""
+    def __init__(self, *args, **kwargs):
+        self.sample_rate = 2.4e6
+        self.center_freq = 100e6
+        self.gain = 'auto'
+        self.rng = np.random.default_rng(0)
+
+    def read_samples(self, n):
+        return (self.rng.normal(size=n) + 1j * self.rng.normal(size=n)) * 0.05
+
+    def read_bytes(self, n):
+        return self.rng.integers(100, 155, size=n).astype(np.uint8).tobytes()
+
+    def close(self):
+        pass
+
+    @staticmethod
+    def get_device_serial_addresses():
+        return ['00000001']
+
+
+_rtlsdr = types.ModuleType('rtlsdr')
+_rtlsdr.RtlSdr = FakeRtlSdr
+sys.modules['rtlsdr'] = _rtlsdr
+
+
+@pytest.fixture(scope='session')
+def rf_ids_fallback():
+    """A second copy of rf_ids loaded as if numba were not installed (NumPy kernels)"""
+    saved = sys.modules.get('numba')
+    sys.modules['numba'] = None  # makes 'import numba' raise ImportError
+    try:
+        spec = importlib.util.spec_from_file_location('rf_ids_fallback', REPO_ROOT / 'rf_ids.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if saved is None:
+            del sys.modules['numba']
+        else:
+            sys.modules['numba'] = saved
+    assert not module.NUMBA_AVAILABLE
+    return module
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    """A working directory holding a copy of the shipped config.json"""
+    shutil.copy(REPO_ROOT / 'config.json', tmp_path / 'config.json')
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def detector(config_dir):
+    import rf_ids
+    det = rf_ids.RFIntrusionDetector()
+    yield det
+    det.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time.monotonic for rf_ids: set clock.now to move time"""
+    import rf_ids
+    class Clock:
+        now = 1000.0
+    monkeypatch.setattr(rf_ids.time, 'monotonic', lambda: Clock.now)
+    return Clock
@@ -0,0 +1,669 @@
+import csv
+import gc
+import io
+import json
+import os
+import threading
+import weakref
+
+import numpy as np
+import pytest
+from scipy import signal
+
+import rf_ids
+
+
+# Failing frequencies: cooldown, then removal
+
+def test_failed_frequency_cools_down_then_is_removed(detector, clock, monkeypatch):
+    def fail(frequency, frequency_hz):
+        raise RuntimeError('tuning failed')
+    monkeypatch.setattr(detector, '_monitor_fast', fail)
+
+    for attempt in range(1, rf_ids.MONITOR_MAX_FAILURES):
+        assert detector.monitor_frequency(200) is False
+        assert detector._monitor_failures[200] == attempt
+        assert detector._cooldown_until[200] == clock.now + rf_ids.MONITOR_RETRY_COOLDOWN
+        assert 200 not in detector._pending_removals
+
+    assert detector.monitor_frequency(200) is False
+    assert detector._pending_removals == {200}
+    assert 200 not in detector._monitor_failures
+    assert 200 not in detector._cooldown_until
+    # Still in the sweep until run() applies the removal
+    assert 200 in detector.config['frequencies']
+
+
+def test_success_clears_failure_count(detector, monkeypatch):
+    calls = []
+    def flaky(frequency, frequency_hz):
+        calls.append(frequency)
+        if len(calls) == 1:
+            raise RuntimeError('tuning failed')
+        return False
+    monkeypatch.setattr(detector, '_monitor_fast', flaky)
+
+    detector.monitor_frequency(433)
+    assert detector._monitor_failures == {433: 1}
+    detector.monitor_frequency(433)
+    assert detector._monitor_failures == {}
+
+
+def _run_sweeps(detector, monkeypatch, sweeps):
+    """Run the main loop for the given number of sweeps, without sleeping"""
+    slept = []
+    monkeypatch.setattr(rf_ids.time, 'sleep', slept.append)
+    remaining = iter(range(sweeps, 0, -1))
+    monkeypatch.setattr(detector, 'handle_user_input', lambda: next(remaining, 0) > 0)
+    detector.baseline = {'data': {f: {} for f in detector.config['frequencies']}}
+    detector.config['proximity_detection']['enabled'] = False
+    detector.run()
+    return slept
+
+
+def test_run_skips_cooling_down_frequencies_and_applies_removals(detector, clock, monkeypatch):
+    scanned = []
+    def scan(frequency):
+        scanned.append(frequency)
+        return False
+    monkeypatch.setattr(detector, 'scan_for_intrusions', scan)
+    detector._cooldown_until[433] = clock.now + 10
+    detector._pending_removals.add(915)
+
+    _run_sweeps(detector, monkeypatch, 1)
+
+    assert 433 not in scanned
+    assert detector.config['frequencies'] == [100, 200, 433]
+    assert detector._pending_removals == set()
+    assert detector._config_dirty
+
+
+def test_run_waits_for_cooldown_when_every_frequency_is_cooling_down(detector, clock, monkeypatch):
+    monkeypatch.setattr(detector, 'scan_for_intrusions', lambda frequency: False)
+    for freq in detector.config['frequencies']:
+        detector._cooldown_until[freq] = clock.now + 1.5
+    detector._cooldown_until[433] = clock.now + 0.5
+
+    slept = _run_sweeps(detector, monkeypatch, 2)
+
+    assert slept == [0.5, 0.5]
+
+
+# Alert throttling
+
+def test_throttle_allows_a_burst_then_suppresses(detector, clock):
+    interval = rf_ids.ANOMALY_ALERT_INTERVAL
+    for _ in range(rf_ids.ALERT_BURST):
+        assert detector.throttle_alert('spectrum_anomaly', interval) == 0
+    assert detector.throttle_alert('spectrum_anomaly', interval) is None
+    assert detector.throttle_alert('spectrum_anomaly', interval) is None
+
+
+def test_throttle_refills_and_reports_suppressed(detector, clock):
+    interval = rf_ids.PROXIMITY_ALERT_INTERVAL
+    for _ in range(rf_ids.ALERT_BURST):
+        detector.throttle_alert('bluetooth', interval)
+    assert detector.throttle_alert('bluetooth', interval) is None
+    assert detector.throttle_alert('bluetooth', interval) is None
+
+    # Half an interval is not enough for a new token...
+    clock.now += interval / 2
+    assert detector.throttle_alert('bluetooth', interval) is None
+    # ...a full one is, and the alert reports the three held back
+    clock.now += interval / 2
+    assert detector.throttle_alert('bluetooth', interval) == 3
+    assert detector.throttle_alert('bluetooth', interval) is None
+
+
+def test_throttle_refill_is_capped_at_the_burst(detector, clock):
+    interval = rf_ids.ANOMALY_ALERT_INTERVAL
+    detector.throttle_alert('spectrum_anomaly', interval)
+    clock.now += 100 * interval
+    results = [detector.throttle_alert('spectrum_anomaly', interval)
+               for _ in range(rf_ids.ALERT_BURST + 1)]
+    assert results == [0] * rf_ids.ALERT_BURST + [None]
+
+
+def test_throttle_kinds_are_independent(detector, clock):
+    for _ in range(rf_ids.ALERT_BURST):
+        detector.throttle_alert('bluetooth', 60)
+    assert detector.throttle_alert('bluetooth', 60) is None
+    assert detector.throttle_alert('cellular', 60) == 0
+
+
+# Config writes
+
+def test_save_config_writes_changes(detector):
+    detector.config['threshold'] = 20
+    detector._config_dirty = True
+    detector.save_config()
+    with open('config.json') as f:
+        assert json.load(f)['threshold'] == 20
+    assert not os.path.exists('config.json.tmp')
+    assert not detector._config_dirty
+
+
+def test_save_config_keeps_the_old_file_if_the_write_fails(detector, monkeypatch):
+    with open('config.json', 'rb') as f:
+        original = f.read()
+    def fail(src, dst):
+        raise OSError('disk full')
+
+    detector.config['threshold'] = 20
+    detector._config_dirty = True
+    with monkeypatch.context() as m:
+        m.setattr(rf_ids.os, 'replace', fail)
+        with pytest.raises(OSError):
+            detector.save_config()
+    with open('config.json', 'rb') as f:
+        assert f.read() == original
+    assert detector._config_dirty
+
+
+def test_save_config_skips_unchanged_file(detector):
+    detector._config_dirty = True
+    detector.save_config()
+    first = os.stat('config.json')
+
+    detector._config_dirty = True
+    detector.save_config()
+    assert os.stat('config.json').st_mtime_ns == first.st_mtime_ns
+    assert os.stat('config.json').st_ino == first.st_ino
+    assert not detector._config_dirty
+
+
+requires_orjson = pytest.mark.skipif(not rf_ids.ORJSON_AVAILABLE, reason="orjson not installed")
+
+
+@requires_orjson
+def test_save_config_json_fallback_matches_orjson(detector, monkeypatch):
+    detector._config_dirty = True
+    detector.save_config()
+    with open('config.json', 'rb') as f:
+        written = f.read()
+
+    monkeypatch.setattr(rf_ids, 'ORJSON_AVAILABLE', False)
+    detector._config_dirty = True
+    detector.save_config()
+    with open('config.json', 'rb') as f:
+        assert f.read() == written
+
+
+@requires_orjson
+def test_save_config_serializes_numpy_values(detector):
+    detector.config['threshold'] = np.int64(15)
+    detector.config['frequencies'] = np.array([100, 433])
+    detector._config_dirty = True
+    detector.save_config()
+    with open('config.json') as f:
+        saved = json.load(f)
+    assert saved['threshold'] == 15
+    assert saved['frequencies'] == [100, 433]
+
+
+def test_config_changes_are_saved_on_a_debounce(detector, clock):
+    detector._last_config_save = clock.now
+    detector.config['frequencies'] = [100, 433]
+    detector._config_dirty = True
+
+    detector.maybe_save_config()
+    assert detector._config_dirty
+    clock.now += rf_ids.CONFIG_SAVE_INTERVAL
+    detector.maybe_save_config()
+    assert not detector._config_dirty
+    with open('config.json') as f:
+        assert json.load(f)['frequencies'] == [100, 433]
+
+
+# Numba kernels agree with the NumPy fallbacks
+
+requires_numba = pytest.mark.skipif(not rf_ids.NUMBA_AVAILABLE, reason="numba not installed")
+
+
+@pytest.fixture
+def spectra():
+    rng = np.random.default_rng(1)
+    current = rng.normal(-50, 10, 1024).astype(np.float32)
+    baseline = rng.normal(-50, 10, 1024).astype(np.float32)
+    return current, baseline
+
+
+@requires_numba
+def test_score_bins_matches_fallback(rf_ids_fallback, spectra):
+    current, baseline = spectra
+    freq_factor = rf_ids._freq_factor(np.linspace(300, 900, current.size))
+    hits, distances, increases = rf_ids._score_bins(current, baseline, freq_factor, 12.0)
+    ref_hits, ref_distances, ref_increases = rf_ids_fallback._score_bins(current, baseline, freq_factor, 12.0)
+
+    assert hits.size > 0
+    np.testing.assert_array_equal(hits, ref_hits)
+    np.testing.assert_allclose(distances, ref_distances, rtol=1e-5, equal_nan=True)
+    np.testing.assert_allclose(increases, ref_increases, rtol=1e-4)
+
+
+def test_score_bins_distances_match_estimate_distance(detector, spectra):
+    current, baseline = spectra
+    freqs = np.linspace(300, 900, current.size)
+    hits, distances, _ = rf_ids._score_bins(current, baseline, rf_ids._freq_factor(freqs), 12.0)
+    above = current[hits] > baseline[hits]
+    expected = detector.estimate_distance(current[hits], baseline[hits], freqs[hits])
+
+    assert above.any() and not above.all()
+    assert np.isnan(distances[~above]).all()
+    # estimate_distance rounds to 0.1 ft
+    np.testing.assert_allclose(distances[above], expected[above], atol=0.05 + 1e-4)
+
+
+@pytest.mark.parametrize('numba_kernels', [True, False])
+def test_capture_spectrum_matches_welch(config_dir, rf_ids_fallback, numba_kernels):
+    module = rf_ids if numba_kernels else rf_ids_fallback
+    det = module.RFIntrusionDetector()
+    try:
+        det.sdr.rng = np.random.default_rng(5)
+        raw = det.sdr.read_bytes(2 * det.config['num_samples'])
+        det.sdr.read_bytes = lambda n: raw
+
+        frequencies, psd = det.capture_spectrum()
+
+        iq = np.frombuffer(raw, dtype=np.uint8) / 127.5 - 1
+        samples = (iq[0::2] + 1j * iq[1::2]).astype(np.complex64)
+        ref_freqs, ref_psd = signal.welch(samples, fs=det.sdr.sample_rate / 1e6,
+                                          nperseg=det.config['fft_size'], return_onesided=False)
+        ref_freqs += det.sdr.center_freq / 1e6 - det.sdr.sample_rate / 2e6
+        np.testing.assert_allclose(psd, 10 * np.log10(ref_psd), atol=1e-3)
+        np.testing.assert_allclose(frequencies, ref_freqs, atol=1e-9)
+    finally:
+        det.close()
+
+
+@requires_numba
+def test_signal_level_matches_fallback(rf_ids_fallback):
+    iq = np.random.default_rng(3).uniform(-0.3, 0.3, 2 * 4096).astype(np.float32)
+    level, db = rf_ids._signal_level(iq)
+    ref_level, ref_db = rf_ids_fallback._signal_level(iq)
+    assert level == pytest.approx(ref_level, abs=1e-5)
+    assert db == pytest.approx(ref_db, abs=1e-4)
+    # Mean I^2 + Q^2 per complex sample
+    assert db == pytest.approx(10 * np.log10(np.mean(iq.astype(np.float64) ** 2) * 2), abs=1e-4)
+
+
+@pytest.mark.parametrize('amplitude', [0.0, 1e-3, 1.0])
+def test_signal_level_stays_in_meter_range(rf_ids_fallback, amplitude):
+    iq = np.full(2 * 1024, amplitude, dtype=np.float32)
+    for module in (rf_ids, rf_ids_fallback):
+        level, _ = module._signal_level(iq)
+        assert 0.1 <= level <= 1.0
+
+
+@pytest.fixture
+def segments():
+    """Complex64 samples for 9 50%-overlapping 256-sample segments, and a Hann window"""
+    n, step, n_seg = 256, 128, 9
+    rng = np.random.default_rng(4)
+    size = n + step * (n_seg - 1)
+    samples = (rng.normal(size=size) + 1j * rng.normal(size=size) + 0.5).astype(np.complex64)
+    window = signal.get_window('hann', n).astype(np.float32)
+    return samples, window, step, n_seg
+
+
+@requires_numba
+def test_window_segments_and_mean_power_match_fallback(rf_ids_fallback, segments):
+    samples, window, step, n_seg = segments
+    n = window.size
+    out = np.empty((n_seg, n), dtype=np.complex64)
+    ref_out = np.empty((n_seg, n), dtype=np.complex64)
+    rf_ids._window_segments(samples, window, step, out)
+    rf_ids_fallback._window_segments(samples, window, step, ref_out)
+    np.testing.assert_allclose(out, ref_out, atol=1e-5)
+
+    spectrum = np.fft.fft(ref_out, axis=1).astype(np.complex64)
+    power = np.empty(n, dtype=np.float32)
+    ref_power = np.empty(n, dtype=np.float32)
+    rf_ids._mean_power(spectrum, power)
+    rf_ids_fallback._mean_power(spectrum, ref_power)
+    np.testing.assert_allclose(power, ref_power, rtol=1e-4)
+    np.testing.assert_allclose(power, np.mean(np.abs(spectrum.astype(np.complex128)) ** 2, axis=0), rtol=1e-4)
+
+
+def test_window_segments_single_precision_matches_double(rf_ids_fallback, segments):
+    samples, window, step, n_seg = segments
+    n = window.size
+    wide = samples.astype(np.complex128)
+    expected = np.stack([wide[s * step:s * step + n] for s in range(n_seg)])
+    expected = (expected - expected.mean(axis=1, keepdims=True)) * window.astype(np.float64)
+
+    for module in (rf_ids, rf_ids_fallback):
+        out = np.empty((n_seg, n), dtype=np.complex64)
+        module._window_segments(samples, window, step, out)
+        np.testing.assert_allclose(out, expected, atol=1e-5)
+
+
+@requires_numba
+def test_power_to_db_matches_fallback(rf_ids_fallback):
+    power = np.random.default_rng(2).uniform(1e-9, 1.0, 1024).astype(np.float32)
+    db = rf_ids._power_to_db(power, -3.5)
+    assert db.dtype == np.float32
+    np.testing.assert_allclose(db, rf_ids_fallback._power_to_db(power, -3.5), atol=1e-4)
+    np.testing.assert_allclose(db, 10 * np.log10(power.astype(np.float64)) - 3.5, atol=1e-4)
+
+
+@requires_numba
+def test_peak_deviation_matches_fallback(rf_ids_fallback, spectra):
+    current, baseline = spectra
+    idx, diff = rf_ids._peak_deviation(current, baseline)
+    ref_idx, ref_diff = rf_ids_fallback._peak_deviation(current, baseline)
+    assert idx == ref_idx
+    assert diff == pytest.approx(ref_diff, rel=1e-6)
+    assert idx == np.abs(current - baseline).argmax()
+
+
+def test_u8_to_iq_scales_like_read_samples(rf_ids_fallback):
+    raw = np.arange(256, dtype=np.uint8).repeat(2)
+    expected = raw / 127.5 - 1.0  # pyrtlsdr's read_samples scaling
+    for module in (rf_ids, rf_ids_fallback):
+        iq = np.empty(raw.size, dtype=np.float32)
+        module._u8_to_iq(raw, iq)
+        np.testing.assert_allclose(iq, expected, atol=1e-6)
+
+
+def test_u8_to_iq_fills_only_the_output_size(rf_ids_fallback):
+    raw = np.full(64, 255, dtype=np.uint8)
+    for module in (rf_ids, rf_ids_fallback):
+        iq = np.zeros(16, dtype=np.float32)
+        module._u8_to_iq(raw, iq)
+        np.testing.assert_allclose(iq, 1.0, atol=1e-6)
+
+
+# RTL-SDR health probe
+
+@pytest.fixture
+def wedged_sdr(detector, monkeypatch):
+    """Make the detector's RTL-SDR hang in read_bytes until the returned event is set"""
+    release = threading.Event()
+    closed = []
+    monkeypatch.setattr(detector.sdr, 'read_bytes', lambda n: release.wait(5))
+    monkeypatch.setattr(detector.sdr, 'close', lambda: closed.append(True))
+    yield release, closed
+    release.set()
+
+
+def test_sdr_healthy_times_out_on_a_hung_read(detector, wedged_sdr):
+    assert detector.sdr_healthy() is False
+    probe = detector._sdr_probe
+    assert probe.is_alive()
+    # A probe still stuck from last time is not joined by a second one
+    assert detector.sdr_healthy() is False
+    assert detector._sdr_probe is probe
+
+
+def test_sdr_is_not_reset_under_a_hung_probe(detector, wedged_sdr, monkeypatch):
+    release, closed = wedged_sdr
+    reopened = []
+    monkeypatch.setattr(detector, '_init_sdr', lambda: reopened.append(True))
+
+    detector._monitor_failed(433, RuntimeError('read failed'))
+    assert closed == [] and reopened == []
+
+    # Once the stuck read returns, the next failure resets the device
+    def fail(n):
+        raise OSError('usb error')
+    release.set()
+    detector._sdr_probe.join(1)
+    monkeypatch.setattr(detector.sdr, 'read_bytes', fail)
+    detector._monitor_failed(433, RuntimeError('read failed'))
+    assert closed == [True] and reopened == [True]
+
+
+def test_close_leaves_the_sdr_to_a_hung_probe(detector, wedged_sdr, monkeypatch):
+    release, closed = wedged_sdr
+    monkeypatch.setattr(rf_ids, 'SDR_CLOSE_WAIT', 0.05)
+    detector.sdr_healthy()
+    detector.close()
+    assert closed == []
+
+
+# Buffered log writes
+
+def _read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+
+def test_log_rows_are_buffered_until_flushed(detector, clock):
+    detector._last_log_flush = clock.now
+    detector.log_anomalies(["a,1\r\n"])
+    assert _read_csv(detector.enhanced_log_file)[1:] == []
+    clock.now += rf_ids.LOG_FLUSH_INTERVAL
+    detector.maybe_flush_log_buffers()
+    assert _read_csv(detector.enhanced_log_file)[1:] == [['a', '1']]
+
+
+def test_log_rows_flush_once_enough_are_pending(detector, clock):
+    detector._last_log_flush = clock.now
+    detector.log_anomalies(["a,1\r\n"] * (rf_ids.LOG_FLUSH_ROWS - 1))
+    assert len(_read_csv(detector.enhanced_log_file)) == 1
+    detector.log_anomalies(["a,1\r\n"])
+    assert len(_read_csv(detector.enhanced_log_file)) == 1 + rf_ids.LOG_FLUSH_ROWS
+
+
+def test_close_writes_pending_log_rows(config_dir):
+    det = rf_ids.RFIntrusionDetector()
+    det.log_anomalies(["a,1\r\n"])
+    det.close()
+    assert _read_csv(det.enhanced_log_file)[1:] == [['a', '1']]
+    assert det._anom_fh.closed
+
+
+def test_close_releases_the_exit_handler(config_dir):
+    det = rf_ids.RFIntrusionDetector()
+    ref = weakref.ref(det)
+    det.close()
+    del det
+    gc.collect()
+    assert ref() is None
+
+
+def _writerow(fields):
+    out = io.StringIO()
+    csv.writer(out).writerow(fields)
+    return out.getvalue()
+
+
+@pytest.mark.parametrize('distance', [12.3, 1.0, "N/A"])
+def test_anomaly_log_line_matches_csv_writer(distance):
+    now, first = '2024-01-02 03:04:05', '2024-01-02 03:00:00'
+    line = rf_ids.ANOMALY_LOG_LINE(now, first, now, 433, 433.0123456, -12.345, 1234.56, distance, "rf_anomaly")
+    assert line == _writerow([now, first, now, 433, "433.012", "-12.35", "1234.6", str(distance), "rf_anomaly"])
+
+
+def test_proximity_log_line_matches_csv_writer():
+    now, first = '2024-01-02 03:04:05', '2024-01-02 03:00:00'
+    line = rf_ids.PROXIMITY_LOG_LINE(now, first, now, 'bluetooth', 2440.0, -41.234, 7.5, 'early_detection')
+    assert line == _writerow([now, first, now, 'bluetooth', 2440.0, "-41.23", 7.5, 'early_detection'])
+
+
+def test_proximity_detections_read_back_from_the_log(detector):
+    detector.log_proximity_detection('bluetooth_2440', 'bluetooth', 2440.0, -41.234, 7.5, 'early_detection')
+    detector.flush_log_buffers()
+    header, row = _read_csv(detector.proximity_log_file)
+    assert header == rf_ids.PROXIMITY_LOG_HEADER
+    assert row[3:] == ['bluetooth', '2440.0', '-41.23', '7.5', 'early_detection']
+    assert row[0] == row[1] == row[2]
+
+
+def test_flush_writes_and_fsyncs_each_pending_log_once(detector, monkeypatch):
+    synced = []
+    monkeypatch.setattr(rf_ids.os, 'fsync', synced.append)
+    detector._legacy_buf.append("20240102_030405,433,433.012,12.35\n20240102_030405,433,433.100,13.00\n")
+    detector._alert_buf.append("20240102_030405,bluetooth,7.5,-41.23,2440.0\n")
+    detector.flush_log_buffers()
+
+    assert sorted(synced) == sorted([detector._legacy_fh.fileno(), detector._alert_fh.fileno()])
+    with open(detector._legacy_fh.name) as f:
+        assert f.read().splitlines() == ["20240102_030405,433,433.012,12.35", "20240102_030405,433,433.100,13.00"]
+    with open(detector._alert_fh.name) as f:
+        assert f.read() == "20240102_030405,bluetooth,7.5,-41.23,2440.0\n"
+    assert not detector._legacy_buf and not detector._alert_buf
+
+
+# Spectral anomaly tracker
+
+def test_track_anomalies_keeps_first_seen_per_anomaly(detector):
+    t0, t1 = '2024-01-02 03:00:00', '2024-01-02 03:05:00'
+    assert detector.track_anomalies(433, [433.1, 433.2], [-40.0, -41.0], t0) == [t0, t0]
+    # Known anomalies keep their first sighting, new ones (and
+    # repeats within the same scan) start now
+    assert detector.track_anomalies(433, [433.3, 433.1, 433.3], [-42.0, -39.0, -42.0], t1) == [t1, t0, t1]
+
+    assert np.all(np.diff(detector._atk_key) > 0)
+    assert detector._atk_key.size == 3
+    i = np.searchsorted(detector._atk_key, 433000 * rf_ids.ANOMALY_KEY_STRIDE + 433100)
+    assert detector._atk_last[i] == np.datetime64(t1)
+    assert detector._atk_power[i] == np.float32(-39.0)
+
+
+def test_track_anomalies_separates_center_frequencies(detector):
+    t0, t1 = '2024-01-02 03:00:00', '2024-01-02 03:05:00'
+    detector.track_anomalies(433, [433.1], [-40.0], t0)
+    assert detector.track_anomalies(434, [433.1], [-40.0], t1) == [t1]
+
+
+def test_track_anomalies_forgets_old_anomalies(detector):
+    detector.config['anomaly_max_age'] = 3600
+    detector.track_anomalies(433, [433.1, 433.2], [-40.0, -41.0], '2024-01-02 03:00:00')
+    detector.track_anomalies(433, [433.2], [-41.0], '2024-01-02 03:30:00')
+    # 433.1 was last seen over an hour ago, 433.2 only 30 minutes ago
+    later = '2024-01-02 04:10:00'
+    assert detector.track_anomalies(433, [433.1, 433.2], [-40.0, -41.0], later) == [later, '2024-01-02 03:00:00']
+
+
+# Log viewer cache
+
+def _append(path, text, mtime):
+    with open(path, 'a', newline='') as f:
+        f.write(text)
+    os.utime(path, (mtime, mtime))
+
+
+def test_read_log_file_parses_only_appended_rows(detector, tmp_path):
+    path = tmp_path / 'log.csv'
+    _append(path, "timestamp,value\r\nt1,1\r\nt2,2\r\n", 1000)
+    entries = detector.read_log_file(0, path)
+    assert list(entries) == [['t2', '2'], ['t1', '1']]
+
+    # Same mtime: served from the cache without reading the file
+    assert detector.read_log_file(0, path) is entries
+
+    # A partial last row waits until it is complete
+    _append(path, "t3,3\r\nt4,", 1001)
+    assert list(detector.read_log_file(0, path)) == [['t3', '3'], ['t2', '2'], ['t1', '1']]
+    _append(path, "4\r\n", 1002)
+    assert list(detector.read_log_file(0, path))[:2] == [['t4', '4'], ['t3', '3']]
+
+
+def test_read_log_file_starts_over_after_truncation(detector, tmp_path):
+    path = tmp_path / 'log.csv'
+    _append(path, "timestamp,value\r\nt1,1\r\nt2,2\r\n", 1000)
+    detector.read_log_file(0, path)
+
+    path.write_text("timestamp,value\r\nt9,9\r\n")
+    os.utime(path, (1001, 1001))
+    assert list(detector.read_log_file(0, path)) == [['t9', '9']]
+
+
+# Adaptive scan stride
+
+@pytest.mark.parametrize('quiet_runs, stride', [(0, 1), (10, 1), (11, 2), (50, 2), (51, 4)])
+def test_scan_stride_coarsens_while_quiet(detector, quiet_runs, stride):
+    detector._adaptive_stride = True
+    detector._quiet_runs = quiet_runs
+    assert detector.scan_stride() == stride
+
+
+def test_strided_scan_reports_full_resolution_bins(detector, monkeypatch):
+    n = 1024
+    frequencies = np.linspace(432.0, 434.0, n)
+    current = np.full(n, -60.0, dtype=np.float32)
+    current[[8, 200]] = [-30.0, -40.0]  # on the 4-bin stride
+    current[9] = -20.0                  # between strided bins, skipped
+    detector.baseline = {'data': {433: {'psd_mean': np.full(n, -60.0, dtype=np.float32)}}}
+    monkeypatch.setattr(detector, 'capture_spectrum', lambda: (frequencies, current))
+    monkeypatch.setattr(detector, 'check_proximity_breach', lambda freq, psd: None)
+    monkeypatch.setattr(detector, 'plot_comparison', lambda *args: None)
+    sent = {}
+    monkeypatch.setattr(detector, 'send_alert', lambda anomalies, freq, filename, **kw: sent.update(anomalies=anomalies, **kw))
+    detector._adaptive_stride = True
+    detector._quiet_runs = 60
+
+    assert detector.scan_for_intrusions(433) is True
+    assert [a['index'] for a in sent['anomalies']] == [8, 200]
+    assert [a['frequency'] for a in sent['anomalies']] == [frequencies[8], frequencies[200]]
+    assert sent['max_anomaly']['index'] == 8
+    assert sent['max_anomaly']['difference'] == pytest.approx(30.0)
+
+
+# Signal increase
+
+@pytest.mark.parametrize('current, baseline', [(50.04, 49.96), (-41.23, -47.0), (-60.0, -50.0), (40.0, 0.0)])
+def test_scalar_signal_increase_matches_array_path(detector, current, baseline):
+    increase = detector.calculate_signal_increase(current, baseline)
+    assert isinstance(increase, float)
+    expected = min(max((10 ** ((current - baseline) / 10) - 1) * 100, 0.0), 10000.0)
+    assert increase == pytest.approx(expected, rel=1e-9, abs=1e-9)
+    assert detector.calculate_signal_increase(np.array([current]), np.array([baseline]))[0] == pytest.approx(expected, rel=1e-4)
+
+
+# Cached tuner range
+
+@pytest.fixture
+def probes(monkeypatch):
+    """Count test_max_frequency runs, which report a 1.5 GHz limit"""
+    calls = []
+    def probe(self):
+        calls.append(True)
+        return 1500e6
+    monkeypatch.setattr(rf_ids.RFIntrusionDetector, 'test_max_frequency', probe)
+    return calls
+
+
+def _set_config(**values):
+    with open('config.json') as f:
+        config = json.load(f)
+    config.update(values)
+    with open('config.json', 'w') as f:
+        json.dump(config, f)
+
+
+def test_max_frequency_is_cached_per_device(config_dir, probes):
+    rf_ids.RFIntrusionDetector().close()
+    rf_ids.RFIntrusionDetector().close()
+    assert len(probes) == 1
+
+
+def test_device_id_tells_tuners_with_the_same_serial_apart(detector, monkeypatch):
+    monkeypatch.setattr(detector.sdr, 'get_tuner_type', lambda: 6, raising=False)  # R820T
+    r820t = detector.get_device_id()
+    monkeypatch.setattr(detector.sdr, 'get_tuner_type', lambda: 1, raising=False)  # E4000
+    assert detector.get_device_id() != r820t
+
+
+def test_reprobe_max_freq_forces_one_fresh_test(config_dir, probes):
+    rf_ids.RFIntrusionDetector().close()
+    _set_config(reprobe_max_freq=True)
+    rf_ids.RFIntrusionDetector().close()
+    assert len(probes) == 2
+    with open('config.json') as f:
+        assert 'reprobe_max_freq' not in json.load(f)
+    rf_ids.RFIntrusionDetector().close()
+    assert len(probes) == 2
+
+
+def test_frequency_dropped_for_failures_invalidates_the_cached_range(config_dir, probes, monkeypatch):
+    det = rf_ids.RFIntrusionDetector()
+    monkeypatch.setattr(det, 'sdr_healthy', lambda: True)
+    for _ in range(rf_ids.MONITOR_MAX_FAILURES):
+        det._monitor_failed(433, OSError('tuning failed'))
+    det._config_dirty = True
+    det.close()
+    rf_ids.RFIntrusionDetector().close()
+    assert len(probes) == 2